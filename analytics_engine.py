@@ -252,6 +252,19 @@ class AnalyticsEngine:
             """, (metric_name, metric_value, datetime.now().isoformat(), interface_type))
             conn.commit()
     
+    def track_system_health_batch(self, metrics: List[Tuple[str, float, str]]):
+        """Track several (metric_name, metric_value, interface_type) health metrics in one commit"""
+        if not metrics:
+            return
+        timestamp = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO system_health 
+                (metric_name, metric_value, timestamp, interface_type)
+                VALUES (?, ?, ?, ?)
+            """, [(name, value, timestamp, interface_type) for name, value, interface_type in metrics])
+            conn.commit()
+    
     def _log_validation(self, data_type: str, data_id: str, validation: ValidationResult):
         """Log validation results for audit trail"""
         with self.get_connection() as conn:
@@ -252,7 +252,7 @@ class MonitoringDashboard:
             safety_report = self.validator.validate_interface_data('ai', {
                 'story_content': 'Sample content for health check',
                 'child_age': 6
-            })
+            }, collect_errors=False)
             
             if not safety_report.is_valid:
                 health_score -= 0.4
@@ -473,7 +473,7 @@ class AutomatedQA:
                 validation_result = self.validator.validate_interface_data('ai', {
                     'story_content': scenario['content'],
                     'child_age': 6
-                })
+                }, collect_errors=False)
                 
                 scenario_passed = validation_result.is_valid == scenario['should_pass']
                 if scenario_passed:
@@ -559,14 +559,14 @@ class AutomatedQA:
                 'average_subscription_price': 20
             }
             
-            business_validation = self.validator.validate_interface_data('business', test_data)
+            business_validation = self.validator.validate_interface_data('business', test_data, collect_errors=False)
             details['freemium_validation'] = business_validation.is_valid
             
             # Test over-limit scenario
             over_limit_data = test_data.copy()
             over_limit_data['monthly_usage'] = config.business.free_tier_stories_per_month + 1
             
-            over_limit_validation = self.validator.validate_interface_data('business', over_limit_data)
+            over_limit_validation = self.validator.validate_interface_data('business', over_limit_data, collect_errors=False)
             details['over_limit_validation'] = not over_limit_validation.is_valid  # Should fail
             
             # Test revenue calculation
@@ -576,7 +576,7 @@ class AutomatedQA:
                 'average_subscription_price': 20
             }
             
-            revenue_validation = self.validator.validate_interface_data('business', revenue_test)
+            revenue_validation = self.validator.validate_interface_data('business', revenue_test, collect_errors=False)
             details['revenue_validation'] = revenue_validation.is_valid
             
             all_tests_passed = (business_validation.is_valid and 
@@ -0,0 +1,179 @@
+-- Sample public domain stories (English and Spanish versions) for an empty library.
+-- Loaded by seed_sample_stories(); triggers fill in the search index, counters
+-- and denormalized author/theme columns. IDs are looked up by name so the
+-- script does not depend on AUTOINCREMENT positions.
+--
+-- The emptiness check lives here, not in Python: executescript() commits any
+-- open transaction first, so only a check inside the script's own
+-- BEGIN IMMEDIATE (which takes the write lock up front) is atomic with the
+-- inserts. Every insert is gated on it; a concurrent or repeated run inserts nothing.
+
+BEGIN IMMEDIATE;
+
+CREATE TEMP TABLE seed_guard AS
+SELECT NOT EXISTS (SELECT 1 FROM stories) AS empty_library;
+
+INSERT INTO authors (name, birth_year, death_year, nationality)
+SELECT * FROM (VALUES
+    ('Traditional Folk Tales', NULL, NULL, 'Various'),
+    ('Aesop', -620, -564, 'Greek'))
+WHERE (SELECT empty_library FROM seed_guard);
+
+INSERT INTO stories (title, word_count, estimated_reading_time, language_code,
+                     publication_year, copyright_status, source_attribution)
+SELECT * FROM (VALUES
+    ('The Three Little Pigs', 262, 1, 'en', 1840, 'public_domain', 'Traditional English folk tale'),
+    ('Los Tres Cerditos', 230, 1, 'es', 1840, 'public_domain', 'Cuento tradicional inglés'),
+    ('The Tortoise and the Hare', 189, 1, 'en', NULL, 'public_domain', 'Aesop''s Fables'),
+    ('La Tortuga y la Liebre', 189, 1, 'es', NULL, 'public_domain', 'Fábulas de Esopo'))
+WHERE (SELECT empty_library FROM seed_guard);
+
+INSERT INTO story_content (story_id, content)
+SELECT story_id, 'Once upon a time, there were three little pigs who went out into the world to build their own homes.
+
+The first little pig was lazy. He built his house out of straw because it was easy and quick. "This will do just fine," he said.
+
+The second little pig worked a bit harder. He built his house out of sticks. "This is stronger than straw," he thought.
+
+The third little pig was very hardworking. He built his house out of bricks, working all day long. "This will keep me safe," he said.
+
+One day, a big bad wolf came along. He smelled the pigs and decided he wanted them for dinner.
+
+First, he went to the straw house. "Little pig, little pig, let me come in!"
+
+"Not by the hair of my chinny-chin-chin!" said the first pig.
+
+"Then I''ll huff and I''ll puff and I''ll blow your house in!" The wolf blew the straw house down, but the pig ran to his brother''s stick house.
+
+The wolf followed. "Little pigs, little pigs, let me come in!"
+
+"Not by the hair of our chinny-chin-chins!"
+
+"Then I''ll huff and I''ll puff and I''ll blow your house in!" The wolf blew the stick house down too, but both pigs ran to their brother''s brick house.
+
+The wolf tried to blow down the brick house, but he couldn''t. He huffed and puffed until he was tired.
+
+The three little pigs were safe in the strong brick house. They learned that hard work and planning ahead keep you safe. And they all lived happily ever after.'
+FROM stories WHERE title = 'The Three Little Pigs' AND (SELECT empty_library FROM seed_guard);
+
+INSERT INTO story_content (story_id, content)
+SELECT story_id, 'Había una vez tres cerditos que salieron al mundo para construir sus propias casas.
+
+El primer cerdito era perezoso. Construyó su casa de paja porque era fácil y rápido. "Esto estará bien," dijo.
+
+El segundo cerdito trabajó un poco más duro. Construyó su casa de palos. "Esto es más fuerte que la paja," pensó.
+
+El tercer cerdito era muy trabajador. Construyó su casa de ladrillos, trabajando todo el día. "Esto me mantendrá seguro," dijo.
+
+Un día, llegó un lobo feroz. Olió a los cerditos y decidió que los quería para la cena.
+
+Primero, fue a la casa de paja. "¡Cerdito, cerdito, déjame entrar!"
+
+"¡No, por los pelos de mi barbilla!" dijo el primer cerdito.
+
+"¡Entonces soplaré y resoplaré y tu casa derribaré!" El lobo derribó la casa de paja, pero el cerdito corrió a la casa de palos de su hermano.
+
+El lobo lo siguió. "¡Cerditos, cerditos, déjenme entrar!"
+
+"¡No, por los pelos de nuestras barbillas!"
+
+"¡Entonces soplaré y resoplaré y su casa derribaré!" El lobo también derribó la casa de palos, pero ambos cerditos corrieron a la casa de ladrillos de su hermano.
+
+El lobo trató de derribar la casa de ladrillos, pero no pudo. Sopló y resopló hasta que se cansó.
+
+Los tres cerditos estaban seguros en la casa fuerte de ladrillos. Aprendieron que el trabajo duro y la planificación los mantienen seguros. Y vivieron felices para siempre.'
+FROM stories WHERE title = 'Los Tres Cerditos' AND (SELECT empty_library FROM seed_guard);
+
+INSERT INTO story_content (story_id, content)
+SELECT story_id, 'Once upon a time, there was a speedy hare who bragged about how fast he could run. Tired of hearing him boast, a tortoise challenged him to a race.
+
+All the animals in the forest gathered to watch. The hare laughed at the tortoise. "This will be the easiest race I''ve ever won," he said.
+
+The race began and the hare darted almost out of sight at once. Soon he was far ahead of the tortoise.
+
+"This is too easy," thought the hare. "I have plenty of time." He decided to take a nap under a shady tree.
+
+Meanwhile, the tortoise kept walking slowly but steadily. Step by step, he moved forward without stopping. He passed the sleeping hare and continued toward the finish line.
+
+The hare woke up and realized the tortoise was almost at the finish line! He ran as fast as he could, but it was too late. The tortoise had won the race!
+
+All the animals cheered for the tortoise. The hare learned an important lesson that day: "Slow and steady wins the race." Hard work and determination are more important than just being fast.'
+FROM stories WHERE title = 'The Tortoise and the Hare' AND (SELECT empty_library FROM seed_guard);
+
+INSERT INTO story_content (story_id, content)
+SELECT story_id, 'Había una vez una liebre muy rápida que se jactaba de lo rápido que podía correr. Cansada de escucharla presumir, una tortuga la desafió a una carrera.
+
+Todos los animales del bosque se reunieron para ver. La liebre se rió de la tortuga. "Esta será la carrera más fácil que haya ganado," dijo.
+
+La carrera comenzó y la liebre salió disparada casi fuera de vista. Pronto estaba muy por delante de la tortuga.
+
+"Esto es muy fácil," pensó la liebre. "Tengo mucho tiempo." Decidió tomar una siesta bajo un árbol con sombra.
+
+Mientras tanto, la tortuga siguió caminando lenta pero constantemente. Paso a paso, se movía hacia adelante sin parar. Pasó a la liebre dormida y continuó hacia la línea de meta.
+
+¡La liebre se despertó y se dio cuenta de que la tortuga estaba casi en la línea de meta! Corrió tan rápido como pudo, pero era demasiado tarde. ¡La tortuga había ganado la carrera!
+
+Todos los animales vitorearon a la tortuga. La liebre aprendió una lección importante ese día: "Lento y constante gana la carrera." El trabajo duro y la determinación son más importantes que ser rápido.'
+FROM stories WHERE title = 'La Tortuga y la Liebre' AND (SELECT empty_library FROM seed_guard);
+
+WITH link(title, author, role) AS (VALUES
+    ('The Three Little Pigs', 'Traditional Folk Tales', 'author'),
+    ('Los Tres Cerditos', 'Aesop', 'author'),
+    ('The Tortoise and the Hare', 'Aesop', 'author'),
+    ('La Tortuga y la Liebre', 'Aesop', 'author')
+)
+INSERT INTO story_authors (story_id, author_id, role)
+SELECT s.story_id, a.author_id, link.role
+FROM link
+JOIN stories s ON s.title = link.title
+JOIN authors a ON a.name = link.author
+WHERE (SELECT empty_library FROM seed_guard);
+
+WITH level(title, age_min, age_max, grade_level_min, grade_level_max, complexity_score) AS (VALUES
+    ('The Three Little Pigs', 3, 7, 1, 3, 3),
+    ('Los Tres Cerditos', 4, 8, 2, 4, 3),
+    ('The Tortoise and the Hare', 4, 8, 2, 4, 3),
+    ('La Tortuga y la Liebre', 4, 8, 2, 4, 3)
+)
+INSERT INTO reading_levels (story_id, age_min, age_max, grade_level_min,
+                            grade_level_max, complexity_score)
+SELECT s.story_id, level.age_min, level.age_max, level.grade_level_min,
+       level.grade_level_max, level.complexity_score
+FROM level
+JOIN stories s ON s.title = level.title
+WHERE (SELECT empty_library FROM seed_guard);
+
+-- Themes outside the essential set are created as needed
+INSERT OR IGNORE INTO themes (name, category)
+SELECT * FROM (VALUES
+    ('Animals', 'subject'),
+    ('Competition', 'social_emotional'),
+    ('Hard Work', 'moral'),
+    ('Perseverance', 'moral'),
+    ('Safety', 'moral'))
+WHERE (SELECT empty_library FROM seed_guard);
+
+WITH link(title, theme, prominence) AS (VALUES
+    ('The Three Little Pigs', 'Hard Work', 8),
+    ('The Three Little Pigs', 'Animals', 7),
+    ('The Three Little Pigs', 'Safety', 6),
+    ('Los Tres Cerditos', 'Perseverance', 9),
+    ('Los Tres Cerditos', 'Animals', 8),
+    ('Los Tres Cerditos', 'Competition', 5),
+    ('The Tortoise and the Hare', 'Perseverance', 9),
+    ('The Tortoise and the Hare', 'Animals', 8),
+    ('The Tortoise and the Hare', 'Competition', 5),
+    ('La Tortuga y la Liebre', 'Perseverance', 9),
+    ('La Tortuga y la Liebre', 'Animals', 8),
+    ('La Tortuga y la Liebre', 'Competition', 5)
+)
+INSERT INTO story_themes (story_id, theme_id, prominence)
+SELECT s.story_id, t.theme_id, link.prominence
+FROM link
+JOIN stories s ON s.title = link.title
+JOIN themes t ON t.name = link.theme
+WHERE (SELECT empty_library FROM seed_guard);
+
+DROP TABLE seed_guard;
+
+COMMIT;
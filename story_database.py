@@ -5,140 +5,353 @@ Professional children's literature cataloging system with SQLAlchemy
 """
 
 import os
+import time
+import atexit
 import json
+import functools
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import sqlite3
+import threading
+import weakref
 from contextlib import contextmanager
 
+try:
+    # pysqlite3-binary bundles a current SQLite; stdlib builds can lag well behind
+    from pysqlite3 import dbapi2 as sqlite3
+except ImportError:
+    import sqlite3
+
 import logging
 logger = logging.getLogger(__name__)
 
+# STORYLINE_PROFILE=1 traces SQL at debug level and checks hot query plans on open
+PROFILE_QUERIES = os.environ.get('STORYLINE_PROFILE') == '1'
+
+# Sample stories loaded by seed_sample_stories
+SEED_SQL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed.sql')
+
+# How long get_database_stats/get_popular_stories results are reused; any
+# write through transaction() drops them sooner
+READ_CACHE_TTL_SECONDS = 30
+
+# INSERT ... RETURNING and ALTER TABLE ... DROP COLUMN need SQLite 3.35+
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+HAS_DROP_COLUMN = HAS_RETURNING
+
+# Age bucket used for catalog statistics; backs the reading_levels.age_group column
+AGE_GROUP_SQL = """
+    CASE 
+        WHEN age_min <= 4 THEN 'Preschool (2-4)'
+        WHEN age_min <= 6 THEN 'Early Elementary (5-6)'
+        WHEN age_min <= 8 THEN 'Elementary (7-8)'
+        WHEN age_min <= 10 THEN 'Middle Elementary (9-10)'
+        ELSE 'Advanced (11+)'
+    END
+"""
+
+# Base tables; every statement is idempotent so this runs on each open
+SCHEMA_SQL = f"""
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS stories (
+    story_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    subtitle TEXT,
+    word_count INTEGER,
+    estimated_reading_time INTEGER,
+    language_code TEXT DEFAULT 'en',
+    publication_year INTEGER,
+    copyright_status TEXT DEFAULT 'public_domain',
+    usage_rights TEXT,
+    source_attribution TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    authors_json TEXT DEFAULT '[]',
+    themes_json TEXT DEFAULT '[]',
+    age_min INTEGER,
+    age_max INTEGER
+);
+
+-- Story text, kept apart so metadata scans of stories stay narrow
+CREATE TABLE IF NOT EXISTS story_content (
+    story_id INTEGER PRIMARY KEY,
+    content TEXT NOT NULL,
+    content_summary TEXT,
+    FOREIGN KEY (story_id) REFERENCES stories(story_id)
+);
+
+CREATE TABLE IF NOT EXISTS authors (
+    author_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    birth_year INTEGER,
+    death_year INTEGER,
+    nationality TEXT,
+    biography TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS story_authors (
+    story_id INTEGER,
+    author_id INTEGER,
+    role TEXT DEFAULT 'author',
+    PRIMARY KEY (story_id, author_id),
+    FOREIGN KEY (story_id) REFERENCES stories(story_id),
+    FOREIGN KEY (author_id) REFERENCES authors(author_id)
+);
+
+CREATE TABLE IF NOT EXISTS reading_levels (
+    story_id INTEGER PRIMARY KEY,
+    lexile_level TEXT,
+    guided_reading_level TEXT,
+    grade_level_min INTEGER,
+    grade_level_max INTEGER,
+    age_min INTEGER,
+    age_max INTEGER,
+    complexity_score INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    age_group TEXT GENERATED ALWAYS AS ({AGE_GROUP_SQL}) VIRTUAL,
+    FOREIGN KEY (story_id) REFERENCES stories(story_id)
+);
+
+CREATE TABLE IF NOT EXISTS themes (
+    theme_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    category TEXT,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS story_themes (
+    story_id INTEGER,
+    theme_id INTEGER,
+    prominence INTEGER DEFAULT 5,
+    PRIMARY KEY (story_id, theme_id),
+    FOREIGN KEY (story_id) REFERENCES stories(story_id),
+    FOREIGN KEY (theme_id) REFERENCES themes(theme_id)
+);
+
+CREATE TABLE IF NOT EXISTS story_stats (
+    story_id INTEGER PRIMARY KEY,
+    times_requested INTEGER DEFAULT 0,
+    times_completed INTEGER DEFAULT 0,
+    average_rating REAL DEFAULT 0.0,
+    total_ratings INTEGER DEFAULT 0,
+    last_requested TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (story_id) REFERENCES stories(story_id)
+);
+
+COMMIT;
+"""
+
+
+class _ThreadConnection:
+    """Holds a thread's connection in thread-local storage
+    
+    When the thread exits its thread-local data is dropped, this holder is
+    collected, and the finalizer registered for it closes the connection.
+    """
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
 class StoryDatabase:
     """Professional story database with library cataloging standards"""
     
     def __init__(self, db_path: str = "storyline_library.db"):
         self.db_path = db_path
+        self.fts_enabled = False
+        self._local = threading.local()
+        self._connections: set = set()
+        self._connections_lock = threading.Lock()
+        self._search_sql_cache: Dict[frozenset, str] = {}
+        self._read_cache: Dict[tuple, Tuple[float, Any]] = {}
         self.init_database()
+        atexit.register(self.close)
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and tune a connection; each thread keeps one for its lifetime"""
+        # Only the owning thread uses it, but close() may run from another.
+        # Transactions are opened explicitly by transaction(), and the larger
+        # statement cache keeps every constant SQL string here prepared.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               isolation_level=None, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -64000")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        if PROFILE_QUERIES:
+            conn.set_trace_callback(logger.debug)
+        
+        with self._connections_lock:
+            self._connections.add(conn)
+        return conn
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager for the calling thread's database connection"""
+        holder = getattr(self._local, 'connection', None)
+        if holder is None:
+            holder = self._local.connection = _ThreadConnection(self._open_connection())
+            # Close it when the thread (and so its holder) goes away
+            weakref.finalize(holder, self._release_connection, holder.conn).atexit = False
+        yield holder.conn
+    
+    def _release_connection(self, conn: sqlite3.Connection):
+        """Close one connection unless close() already has"""
+        with self._connections_lock:
+            if conn not in self._connections:
+                return
+            self._connections.discard(conn)
+        self._close_connection(conn)
+    
+    @staticmethod
+    def _close_connection(conn: sqlite3.Connection):
         try:
-            yield conn
-        finally:
+            # Refresh planner statistics if the workload warrants it
+            conn.execute("PRAGMA optimize")
             conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing database connection: {e}")
+    
+    def close(self):
+        """Close every connection opened by this instance"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, set()
+        self._local = threading.local()
+        
+        for conn in connections:
+            self._close_connection(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """Context manager grouping writes into one transaction
+        
+        Nested use joins the outermost transaction, which commits on success
+        and rolls back on error.
+        """
+        with self.get_connection() as conn:
+            if getattr(self._local, 'in_transaction', False):
+                yield conn
+                return
+            
+            self._local.in_transaction = True
+            try:
+                conn.execute("BEGIN")
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._local.in_transaction = False
+                self._read_cache.clear()
+    
+    def _cached_read(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """Return compute()'s result, reused for READ_CACHE_TTL_SECONDS"""
+        cached = self._read_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now < cached[0]:
+            return cached[1]
+        value = compute()
+        self._read_cache[key] = (now + READ_CACHE_TTL_SECONDS, value)
+        return value
     
     def init_database(self):
         """Initialize database with production-ready schema"""
         logger.info("Initializing database with production schema")
         self._create_minimal_schema()
+        self._ensure_indexes()
+        if PROFILE_QUERIES:
+            self._profile_query_plans()
+    
+    def _ensure_indexes(self):
+        """Create indexes for the search, stats and popularity query paths
+        
+        Columns leading a composite primary key (story_authors.story_id,
+        story_themes.story_id) are already indexed by it.
+        """
+        indexes = {
+            'idx_stories_language': 'stories(language_code)',
+            'idx_stories_copyright': 'stories(copyright_status)',
+            'idx_stories_reading_time': 'stories(estimated_reading_time)',
+            'idx_stories_search': 'stories(language_code, copyright_status, estimated_reading_time)',
+            'idx_stories_age': 'stories(age_min, age_max)',
+            'idx_reading_levels_age': 'reading_levels(age_min, age_max)',
+            'idx_reading_levels_age_group': 'reading_levels(age_group)',
+            'idx_story_authors_author': 'story_authors(author_id)',
+            'idx_story_themes_theme': 'story_themes(theme_id)',
+            'idx_story_stats_requested': 'story_stats(times_requested DESC)'
+        }
+        
+        with self.transaction() as conn:
+            for name, target in indexes.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+            
+            # Give the planner statistics the first time round; PRAGMA optimize
+            # on close keeps them fresh afterwards
+            if not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            ).fetchone():
+                conn.execute("ANALYZE")
+    
+    def _profile_query_plans(self):
+        """Check that the hot read queries are served by indexes"""
+        search_params = {'age': 8, 'language_code': 'en', 'copyright_status': 'public_domain',
+                         'max_reading_time': 10, 'limit': 10}
+        checks = [
+            (self._search_query(frozenset({'age'})), search_params),
+            (self._search_query(frozenset({'language_code', 'copyright_status', 'max_reading_time'})),
+             search_params),
+            (self._POPULAR_QUERY.format(age_filter=self._POPULAR_AGE_FILTER), (8, 8, 10)),
+            (self._POPULAR_QUERY.format(age_filter=''), (10,)),
+            (self._STATS_QUERY, ())
+        ]
+        unindexed = [sql for sql, params in checks if not self._assert_indexed(sql, params)]
+        if unindexed:
+            logger.warning(f"{len(unindexed)} of {len(checks)} profiled queries scan a table")
+    
+    # Tables that stay a handful of rows, where a full scan is the right plan
+    _SMALL_TABLES = {'meta_counters'}
+    
+    def _assert_indexed(self, sql: str, params) -> bool:
+        """Log and return False if the query plan scans a table without an index"""
+        with self.get_connection() as conn:
+            plan = [row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        
+        scans = [
+            step for step in plan
+            if step.startswith('SCAN ') and ' USING ' not in step and 'VIRTUAL TABLE' not in step
+            and step.split()[1] not in self._SMALL_TABLES
+        ]
+        if scans:
+            logger.warning(f"Unindexed scan ({'; '.join(scans)}) in query: {' '.join(sql.split())}")
+        return not scans
     
     def _create_minimal_schema(self):
         """Create production-ready schema with proper error handling"""
         with self.get_connection() as conn:
             try:
-                # Stories table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS stories (
-                        story_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        subtitle TEXT,
-                        content TEXT NOT NULL,
-                        content_summary TEXT,
-                        word_count INTEGER,
-                        estimated_reading_time INTEGER,
-                        language_code TEXT DEFAULT 'en',
-                        publication_year INTEGER,
-                        copyright_status TEXT DEFAULT 'public_domain',
-                        usage_rights TEXT,
-                        source_attribution TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
+                # One parse for all tables; the migrations below then run in
+                # their own transaction
+                conn.executescript(SCHEMA_SQL)
+                conn.execute("BEGIN")
                 
-                # Authors table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS authors (
-                        author_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        birth_year INTEGER,
-                        death_year INTEGER,
-                        nationality TEXT,
-                        biography TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
+                self._migrate_story_content(conn)
                 
-                # Story-Author relationships
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS story_authors (
-                        story_id INTEGER,
-                        author_id INTEGER,
-                        role TEXT DEFAULT 'author',
-                        PRIMARY KEY (story_id, author_id),
-                        FOREIGN KEY (story_id) REFERENCES stories(story_id),
-                        FOREIGN KEY (author_id) REFERENCES authors(author_id)
-                    )
-                """)
-                
-                # Reading levels
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS reading_levels (
-                        story_id INTEGER PRIMARY KEY,
-                        lexile_level TEXT,
-                        guided_reading_level TEXT,
-                        grade_level_min INTEGER,
-                        grade_level_max INTEGER,
-                        age_min INTEGER,
-                        age_max INTEGER,
-                        complexity_score INTEGER,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (story_id) REFERENCES stories(story_id)
-                    )
-                """)
-                
-                # Themes
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS themes (
-                        theme_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL UNIQUE,
-                        category TEXT,
-                        description TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Story-Theme relationships
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS story_themes (
-                        story_id INTEGER,
-                        theme_id INTEGER,
-                        prominence INTEGER DEFAULT 5,
-                        PRIMARY KEY (story_id, theme_id),
-                        FOREIGN KEY (story_id) REFERENCES stories(story_id),
-                        FOREIGN KEY (theme_id) REFERENCES themes(theme_id)
-                    )
-                """)
-                
-                # Usage statistics
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS story_stats (
-                        story_id INTEGER PRIMARY KEY,
-                        times_requested INTEGER DEFAULT 0,
-                        times_completed INTEGER DEFAULT 0,
-                        average_rating REAL DEFAULT 0.0,
-                        total_ratings INTEGER DEFAULT 0,
-                        last_requested TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (story_id) REFERENCES stories(story_id)
-                    )
-                """)
+                # Tables created before age_group existed get it added in place
+                columns = {row['name'] for row in conn.execute("PRAGMA table_xinfo(reading_levels)")}
+                if 'age_group' not in columns:
+                    conn.execute(f"""
+                        ALTER TABLE reading_levels 
+                        ADD COLUMN age_group TEXT GENERATED ALWAYS AS ({AGE_GROUP_SQL}) VIRTUAL
+                    """)
                 
                 # Insert essential themes
                 themes_data = [
@@ -157,11 +370,21 @@ class StoryDatabase:
                     VALUES (?, ?, ?)
                 """, themes_data)
                 
-                # Create indexes
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_stories_language ON stories(language_code)")
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_stories_copyright ON stories(copyright_status)")
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_reading_levels_age ON reading_levels(age_min, age_max)")
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_story_stats_requested ON story_stats(times_requested DESC)")
+                # Full-text index over story text for interest keyword search
+                self._create_fts_index(conn)
+                
+                # Trigger-maintained counters backing get_database_stats
+                self._create_stats_counters(conn)
+                
+                # Author/theme names and age range copied onto stories for search
+                self._create_denormalized_columns(conn)
+                
+                # Story text goes with its story
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS stories_content_ad AFTER DELETE ON stories BEGIN
+                        DELETE FROM story_content WHERE story_id = old.story_id;
+                    END
+                """)
                 
                 conn.commit()
                 logger.info("Production schema created successfully")
@@ -171,8 +394,236 @@ class StoryDatabase:
                 conn.rollback()
                 raise
     
-    def add_story(self, story_data: Dict[str, Any]) -> int:
-        """Add a new story to the database"""
+    def _migrate_story_content(self, conn):
+        """Move content columns of an older stories table into story_content"""
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(stories)")}
+        if 'content' not in columns:
+            return
+        
+        if not HAS_DROP_COLUMN:
+            raise RuntimeError(
+                f"SQLite {sqlite3.sqlite_version} cannot migrate stories.content; 3.35+ required"
+            )
+        
+        logger.info("Moving story content into the story_content table")
+        conn.execute("""
+            INSERT OR IGNORE INTO story_content (story_id, content, content_summary)
+            SELECT story_id, content, content_summary FROM stories
+        """)
+        
+        # The previous FTS index and its triggers read the old columns
+        for trigger in ('stories_fts_ai', 'stories_fts_ad', 'stories_fts_au'):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS stories_fts")
+        
+        conn.execute("ALTER TABLE stories DROP COLUMN content")
+        conn.execute("ALTER TABLE stories DROP COLUMN content_summary")
+    
+    def _create_fts_index(self, conn):
+        """Create the FTS5 index over story title and text, kept in sync by triggers"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stories_fts'"
+        ).fetchone()
+        
+        # The indexed columns span stories and story_content, so the index
+        # keeps its own copy of the text rather than using external content
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5(
+                    title, content, content_summary
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, keyword search limited to themes: {e}")
+            self.fts_enabled = False
+            return
+        
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS story_content_fts_ai AFTER INSERT ON story_content BEGIN
+                INSERT INTO stories_fts (rowid, title, content, content_summary)
+                VALUES (new.story_id,
+                        (SELECT title FROM stories WHERE story_id = new.story_id),
+                        new.content, new.content_summary);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS story_content_fts_au AFTER UPDATE ON story_content BEGIN
+                UPDATE stories_fts SET content = new.content, content_summary = new.content_summary
+                WHERE rowid = new.story_id;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS story_content_fts_ad AFTER DELETE ON story_content BEGIN
+                DELETE FROM stories_fts WHERE rowid = old.story_id;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS stories_fts_title_au AFTER UPDATE OF title ON stories BEGIN
+                UPDATE stories_fts SET title = new.title WHERE rowid = new.story_id;
+            END
+        """)
+        
+        # Index stories that were added before the FTS table existed
+        if not exists:
+            conn.execute("""
+                INSERT INTO stories_fts (rowid, title, content, content_summary)
+                SELECT s.story_id, s.title, c.content, c.content_summary
+                FROM stories s
+                JOIN story_content c ON s.story_id = c.story_id
+            """)
+        
+        self.fts_enabled = True
+    
+    def _create_denormalized_columns(self, conn):
+        """Keep stories.authors_json/themes_json/age_min/age_max in sync via triggers"""
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(stories)")}
+        backfill = 'authors_json' not in columns
+        if backfill:
+            conn.execute("ALTER TABLE stories ADD COLUMN authors_json TEXT DEFAULT '[]'")
+            conn.execute("ALTER TABLE stories ADD COLUMN themes_json TEXT DEFAULT '[]'")
+            conn.execute("ALTER TABLE stories ADD COLUMN age_min INTEGER")
+            conn.execute("ALTER TABLE stories ADD COLUMN age_max INTEGER")
+        
+        refresh_authors = """
+            UPDATE stories SET authors_json = (
+                SELECT json_group_array(DISTINCT a.name)
+                FROM story_authors sa
+                JOIN authors a ON sa.author_id = a.author_id
+                WHERE sa.story_id = stories.story_id
+            ) WHERE {where};
+        """
+        refresh_themes = """
+            UPDATE stories SET themes_json = (
+                SELECT json_group_array(DISTINCT t.name)
+                FROM story_themes st
+                JOIN themes t ON st.theme_id = t.theme_id
+                WHERE st.story_id = stories.story_id
+            ) WHERE {where};
+        """
+        set_ages = "UPDATE stories SET age_min = {row}.age_min, age_max = {row}.age_max WHERE story_id = {row}.story_id;"
+        
+        triggers = {
+            'story_authors_denorm_ai': ("AFTER INSERT ON story_authors",
+                                        refresh_authors.format(where="story_id = new.story_id")),
+            'story_authors_denorm_ad': ("AFTER DELETE ON story_authors",
+                                        refresh_authors.format(where="story_id = old.story_id")),
+            'authors_denorm_au': ("AFTER UPDATE OF name ON authors",
+                                  refresh_authors.format(where=
+                                      "story_id IN (SELECT story_id FROM story_authors WHERE author_id = new.author_id)")),
+            'story_themes_denorm_ai': ("AFTER INSERT ON story_themes",
+                                       refresh_themes.format(where="story_id = new.story_id")),
+            'story_themes_denorm_ad': ("AFTER DELETE ON story_themes",
+                                       refresh_themes.format(where="story_id = old.story_id")),
+            'themes_denorm_au': ("AFTER UPDATE OF name ON themes",
+                                 refresh_themes.format(where=
+                                     "story_id IN (SELECT story_id FROM story_themes WHERE theme_id = new.theme_id)")),
+            'reading_levels_denorm_ai': ("AFTER INSERT ON reading_levels", set_ages.format(row='new')),
+            'reading_levels_denorm_au': ("AFTER UPDATE OF age_min, age_max ON reading_levels",
+                                         set_ages.format(row='new')),
+            'reading_levels_denorm_ad': ("AFTER DELETE ON reading_levels",
+                                         "UPDATE stories SET age_min = NULL, age_max = NULL "
+                                         "WHERE story_id = old.story_id;"),
+        }
+        for name, (event, body) in triggers.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+        
+        # Existing rows were written before the columns existed
+        if backfill:
+            conn.execute(refresh_authors.format(where="1"))
+            conn.execute(refresh_themes.format(where="1"))
+            conn.execute("""
+                UPDATE stories SET 
+                    age_min = (SELECT age_min FROM reading_levels rl WHERE rl.story_id = stories.story_id),
+                    age_max = (SELECT age_max FROM reading_levels rl WHERE rl.story_id = stories.story_id)
+            """)
+    
+    def _create_stats_counters(self, conn):
+        """Create the meta_counters table and the triggers that keep it current"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta_counters'"
+        ).fetchone()
+        
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta_counters (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        
+        def bump(key_sql: str, delta: int) -> str:
+            return f"""
+                INSERT INTO meta_counters (key, value) VALUES ({key_sql}, {delta})
+                ON CONFLICT(key) DO UPDATE SET value = value + ({delta});
+            """
+        
+        copyright_key = "'copyright:' || COALESCE({row}.copyright_status, 'unknown')"
+        age_group_key = "'age_group:' || {row}.age_group"
+        
+        triggers = {
+            'stories_count_ai': ("AFTER INSERT ON stories",
+                                 bump("'total_stories'", 1) +
+                                 bump(copyright_key.format(row='new'), 1)),
+            'stories_count_ad': ("AFTER DELETE ON stories",
+                                 bump("'total_stories'", -1) +
+                                 bump(copyright_key.format(row='old'), -1)),
+            'stories_count_au': ("AFTER UPDATE OF copyright_status ON stories",
+                                 bump(copyright_key.format(row='old'), -1) +
+                                 bump(copyright_key.format(row='new'), 1)),
+            'authors_count_ai': ("AFTER INSERT ON authors", bump("'total_authors'", 1)),
+            'authors_count_ad': ("AFTER DELETE ON authors", bump("'total_authors'", -1)),
+            'reading_levels_count_ai': ("AFTER INSERT ON reading_levels",
+                                        bump(age_group_key.format(row='new'), 1)),
+            'reading_levels_count_ad': ("AFTER DELETE ON reading_levels",
+                                        bump(age_group_key.format(row='old'), -1)),
+            'reading_levels_count_au': ("AFTER UPDATE OF age_min ON reading_levels",
+                                        bump(age_group_key.format(row='old'), -1) +
+                                        bump(age_group_key.format(row='new'), 1)),
+        }
+        for name, (event, body) in triggers.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+        
+        # Backfill counters for databases that predate the table
+        if not exists:
+            conn.execute("""
+                INSERT INTO meta_counters (key, value)
+                SELECT 'total_stories', COUNT(*) FROM stories
+                UNION ALL
+                SELECT 'total_authors', COUNT(*) FROM authors
+            """)
+            conn.execute(f"""
+                INSERT INTO meta_counters (key, value)
+                SELECT {copyright_key.format(row='stories')}, COUNT(*)
+                FROM stories GROUP BY 1
+                UNION ALL
+                SELECT {age_group_key.format(row='reading_levels')}, COUNT(*)
+                FROM reading_levels GROUP BY age_group
+            """)
+    
+    @staticmethod
+    def _fts_match_expression(terms: List[str]) -> str:
+        """Build an FTS5 MATCH expression that ORs each term as a quoted phrase"""
+        return ' OR '.join('"' + term.replace('"', '""') + '"' for term in terms)
+    
+    _INSERT_STORY_SQL = """
+        INSERT INTO stories (title, subtitle, 
+                           word_count, estimated_reading_time, language_code,
+                           publication_year, copyright_status, usage_rights, 
+                           source_attribution)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    _INSERT_STORY_CONTENT_SQL = """
+        INSERT INTO story_content (story_id, content, content_summary)
+        VALUES (?, ?, ?)
+    """
+    
+    _INSERT_AUTHOR_SQL = """
+        INSERT INTO authors (name, birth_year, death_year, nationality, biography)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    
+    def _story_row(self, story_data: Dict[str, Any]) -> tuple:
+        """Validate story data, fill in derived fields and build its stories row"""
         required_fields = ['title', 'content']
         for field in required_fields:
             if field not in story_data:
@@ -186,73 +637,103 @@ class StoryDatabase:
         if 'estimated_reading_time' not in story_data:
             story_data['estimated_reading_time'] = max(1, story_data['word_count'] // 150)
         
-        with self.get_connection() as conn:
+        return (
+            story_data['title'],
+            story_data.get('subtitle'),
+            story_data['word_count'],
+            story_data['estimated_reading_time'],
+            story_data.get('language_code', 'en'),
+            story_data.get('publication_year'),
+            story_data.get('copyright_status', 'unknown'),
+            story_data.get('usage_rights'),
+            story_data.get('source_attribution')
+        )
+    
+    def add_story(self, story_data: Dict[str, Any]) -> int:
+        """Add a new story to the database"""
+        row = self._story_row(story_data)
+        
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO stories (title, subtitle, content, content_summary, 
-                                   word_count, estimated_reading_time, language_code,
-                                   publication_year, copyright_status, usage_rights, 
-                                   source_attribution)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                story_data['title'],
-                story_data.get('subtitle'),
-                story_data['content'],
-                story_data.get('content_summary'),
-                story_data['word_count'],
-                story_data['estimated_reading_time'],
-                story_data.get('language_code', 'en'),
-                story_data.get('publication_year'),
-                story_data.get('copyright_status', 'unknown'),
-                story_data.get('usage_rights'),
-                story_data.get('source_attribution')
-            ))
+            cursor.execute(self._INSERT_STORY_SQL, row)
             story_id = cursor.lastrowid
-            conn.commit()
+            
+            cursor.execute(self._INSERT_STORY_CONTENT_SQL,
+                           (story_id, story_data['content'], story_data.get('content_summary')))
             
             logger.info(f"Added story '{story_data['title']}' with ID {story_id}")
             return story_id
     
+    def add_story_complete(self, story_data: Dict[str, Any],
+                           author_ids: Optional[List[int]] = None,
+                           reading_level: Optional[Dict[str, Any]] = None,
+                           themes: Optional[List[Tuple[str, str, int]]] = None) -> int:
+        """Add a story with its authors, reading level and themes in one transaction
+        
+        reading_level takes set_reading_level's keyword arguments; themes are
+        (name, category, prominence) tuples as for add_themes_to_story.
+        """
+        with self.transaction():
+            story_id = self.add_story(story_data)
+            
+            for author_id in author_ids or []:
+                self.link_story_author(story_id, author_id)
+            
+            if reading_level:
+                self.set_reading_level(story_id, **reading_level)
+            
+            if themes:
+                self.add_themes_to_story(story_id, themes)
+            
+            return story_id
+    
     def add_author(self, name: str, birth_year: Optional[int] = None, 
                    death_year: Optional[int] = None, nationality: Optional[str] = None,
                    biography: Optional[str] = None) -> int:
         """Add an author to the database"""
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO authors (name, birth_year, death_year, nationality, biography)
-                VALUES (?, ?, ?, ?, ?)
-            """, (name, birth_year, death_year, nationality, biography))
+            cursor.execute(self._INSERT_AUTHOR_SQL,
+                           (name, birth_year, death_year, nationality, biography))
             author_id = cursor.lastrowid
-            conn.commit()
             return author_id
     
     def link_story_author(self, story_id: int, author_id: int, role: str = 'author'):
         """Link a story to an author"""
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO story_authors (story_id, author_id, role)
                 VALUES (?, ?, ?)
             """, (story_id, author_id, role))
-            conn.commit()
     
     def set_reading_level(self, story_id: int, age_min: int, age_max: int,
                          grade_min: Optional[int] = None, grade_max: Optional[int] = None,
                          lexile_level: Optional[str] = None,
                          guided_reading_level: Optional[str] = None):
         """Set reading level metadata for a story"""
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
+            # UPSERT rather than INSERT OR REPLACE: REPLACE deletes silently
+            # without firing the delete trigger that keeps meta_counters right
             conn.execute("""
-                INSERT OR REPLACE INTO reading_levels 
+                INSERT INTO reading_levels 
                 (story_id, age_min, age_max, grade_level_min, grade_level_max, 
                  lexile_level, guided_reading_level, complexity_score)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(story_id) DO UPDATE SET
+                    age_min = excluded.age_min,
+                    age_max = excluded.age_max,
+                    grade_level_min = excluded.grade_level_min,
+                    grade_level_max = excluded.grade_level_max,
+                    lexile_level = excluded.lexile_level,
+                    guided_reading_level = excluded.guided_reading_level,
+                    complexity_score = excluded.complexity_score
             """, (story_id, age_min, age_max, grade_min, grade_max, 
                   lexile_level, guided_reading_level, 
                   self._calculate_complexity_score(age_min, age_max)))
-            conn.commit()
     
-    def _calculate_complexity_score(self, age_min: int, age_max: int) -> int:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _calculate_complexity_score(age_min: int, age_max: int) -> int:
         """Calculate complexity score based on age range"""
         avg_age = (age_min + age_max) / 2
         if avg_age <= 4:
@@ -269,361 +750,310 @@ class StoryDatabase:
     def add_theme_to_story(self, story_id: int, theme_name: str, 
                           category: str = 'general', prominence: int = 5):
         """Add a theme to a story"""
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             # Get or create theme
             cursor = conn.cursor()
-            cursor.execute("SELECT theme_id FROM themes WHERE name = ?", (theme_name,))
-            row = cursor.fetchone()
-            
-            if row:
-                theme_id = row[0]
-            else:
+            if HAS_RETURNING:
+                # The no-op DO UPDATE makes RETURNING fire for existing themes too
                 cursor.execute("""
                     INSERT INTO themes (name, category)
                     VALUES (?, ?)
+                    ON CONFLICT(name) DO UPDATE SET 
+                        category = COALESCE(themes.category, excluded.category)
+                    RETURNING theme_id
                 """, (theme_name, category))
-                theme_id = cursor.lastrowid
+                theme_id = cursor.fetchone()[0]
+            else:
+                cursor.execute("SELECT theme_id FROM themes WHERE name = ?", (theme_name,))
+                row = cursor.fetchone()
+                
+                if row:
+                    theme_id = row[0]
+                else:
+                    cursor.execute("""
+                        INSERT INTO themes (name, category)
+                        VALUES (?, ?)
+                    """, (theme_name, category))
+                    theme_id = cursor.lastrowid
             
             # Link story to theme
             cursor.execute("""
                 INSERT OR REPLACE INTO story_themes (story_id, theme_id, prominence)
                 VALUES (?, ?, ?)
             """, (story_id, theme_id, prominence))
+    
+    def add_themes_to_story(self, story_id: int, themes: List[Tuple[str, str, int]]):
+        """Add several (name, category, prominence) themes to a story at once"""
+        self._add_themes_bulk([(story_id, *theme) for theme in themes])
+    
+    def _add_themes_bulk(self, links: List[Tuple[int, str, str, int]]):
+        """Link many (story_id, theme_name, category, prominence) themes to stories"""
+        if not links:
+            return
+        
+        names = list({name for _, name, _, _ in links})
+        lookup = f"SELECT name, theme_id FROM themes WHERE name IN ({','.join('?' * len(names))})"
+        
+        with self.transaction() as conn:
+            # Resolve every theme in one query, creating only the missing ones
+            theme_ids = dict(conn.execute(lookup, names).fetchall())
+            missing = {name: category for _, name, category, _ in links if name not in theme_ids}
+            if missing:
+                conn.executemany("""
+                    INSERT INTO themes (name, category)
+                    VALUES (?, ?)
+                    ON CONFLICT(name) DO NOTHING
+                """, missing.items())
+                theme_ids.update(conn.execute(lookup, names).fetchall())
             
-            conn.commit()
+            conn.executemany("""
+                INSERT OR REPLACE INTO story_themes (story_id, theme_id, prominence)
+                VALUES (?, ?, ?)
+            """, [(story_id, theme_ids[name], prominence) for story_id, name, _, prominence in links])
+    
+    # Author/theme names and the age range are denormalized onto stories,
+    # so search reads a single table (plus story_content when text is wanted)
+    _SEARCH_QUERY = """
+        SELECT s.story_id, s.title, s.word_count, 
+               s.estimated_reading_time, s.copyright_status,
+               s.age_min, s.age_max, s.authors_json, s.themes_json{content_columns}
+        FROM stories s{content_join}
+        WHERE 1=1{filters}
+        ORDER BY s.story_id LIMIT :limit
+    """
+    
+    _SEARCH_FILTERS = {
+        'age': " AND s.age_min <= :age AND s.age_max >= :age",
+        'max_reading_time': " AND s.estimated_reading_time <= :max_reading_time",
+        'copyright_status': " AND s.copyright_status = :copyright_status",
+        'language_code': " AND s.language_code = :language_code",
+        # Interests arrive as one JSON array so the SQL text does not vary with their count
+        'interests': """
+            AND (EXISTS (
+                SELECT 1 FROM json_each(s.themes_json) t, json_each(:interests_json) i
+                WHERE t.value LIKE '%' || i.value || '%'
+            ){fts_clause})
+        """
+    }
+    
+    _SEARCH_FTS_CLAUSE = " OR s.story_id IN (SELECT rowid FROM stories_fts WHERE stories_fts MATCH :interests_match)"
+    
+    def _search_query(self, active_filters: frozenset) -> str:
+        """Render (once) the search SQL for a given set of active filters
+        
+        Returning the identical string for a given filter shape also lets the
+        connection's statement cache reuse the prepared statement.
+        """
+        query = self._search_sql_cache.get(active_filters)
+        if query is None:
+            with_content = 'content' in active_filters
+            fts_clause = self._SEARCH_FTS_CLAUSE if self.fts_enabled else ''
+            filters = ''.join(
+                clause.replace('{fts_clause}', fts_clause)
+                for name, clause in self._SEARCH_FILTERS.items()
+                if name in active_filters
+            )
+            query = self._SEARCH_QUERY.format(
+                filters=filters,
+                content_columns=", c.content" if with_content else "",
+                content_join=" JOIN story_content c ON s.story_id = c.story_id" if with_content else ""
+            )
+            self._search_sql_cache[active_filters] = query
+        return query
     
     def search_stories(self, age: Optional[int] = None, 
                       interests: List[str] = None,
                       max_reading_time: Optional[int] = None,
                       copyright_status: Optional[str] = None,
                       language_code: Optional[str] = None,
-                      limit: int = 10) -> List[Dict[str, Any]]:
-        """Search for stories based on criteria"""
-        
-        query = """
-            SELECT DISTINCT s.story_id, s.title, s.content, s.word_count, 
-                   s.estimated_reading_time, s.copyright_status,
-                   GROUP_CONCAT(DISTINCT a.name) as authors,
-                   rl.age_min, rl.age_max,
-                   GROUP_CONCAT(DISTINCT t.name) as themes
-            FROM stories s
-            LEFT JOIN story_authors sa ON s.story_id = sa.story_id
-            LEFT JOIN authors a ON sa.author_id = a.author_id  
-            LEFT JOIN reading_levels rl ON s.story_id = rl.story_id
-            LEFT JOIN story_themes st ON s.story_id = st.story_id
-            LEFT JOIN themes t ON st.theme_id = t.theme_id
-            WHERE 1=1
-        """
-        
-        params = []
+                      limit: int = 10,
+                      include_content: bool = True) -> List[Dict[str, Any]]:
+        """Search for stories based on criteria
         
-        # Age filtering
-        if age is not None:
-            query += " AND rl.age_min <= ? AND rl.age_max >= ?"
-            params.extend([age, age])
+        Pass include_content=False for catalog listings that only need metadata.
+        """
         
-        # Reading time filtering
-        if max_reading_time is not None:
-            query += " AND s.estimated_reading_time <= ?"
-            params.append(max_reading_time)
+        # Interest matching covers theme names, plus story text when FTS is available
+        interests = [interest.strip() for interest in interests or [] if interest.strip()]
         
-        # Copyright status filtering
-        if copyright_status is not None:
-            query += " AND s.copyright_status = ?"
-            params.append(copyright_status)
+        params = {
+            'age': age,
+            'max_reading_time': max_reading_time,
+            'copyright_status': copyright_status,
+            'language_code': language_code,
+            'limit': limit
+        }
+        active_filters = {name for name in self._SEARCH_FILTERS if params.get(name) is not None}
         
-        # Language filtering
-        if language_code is not None:
-            query += " AND s.language_code = ?"
-            params.append(language_code)
+        if include_content:
+            active_filters.add('content')
         
-        # Interest-based theme filtering
         if interests:
-            interest_conditions = []
-            for interest in interests:
-                interest_conditions.append("t.name LIKE ?")
-                params.append(f"%{interest}%")
-            if interest_conditions:
-                query += f" AND ({' OR '.join(interest_conditions)})"
+            active_filters.add('interests')
+            params['interests_json'] = json.dumps(interests)
+            params['interests_match'] = self._fts_match_expression(interests)
         
-        query += " GROUP BY s.story_id ORDER BY s.story_id LIMIT ?"
-        params.append(limit)
+        query = self._search_query(frozenset(active_filters))
         
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+            cursor = conn.execute(query, params)
+            row_to_dict = self._row_to_dict
             
+            # Convert in batches rather than holding every raw row at once
             stories = []
-            for row in rows:
-                story = {
-                    'story_id': row['story_id'],
-                    'title': row['title'],
-                    'content': row['content'],
-                    'word_count': row['word_count'],
-                    'estimated_reading_time': row['estimated_reading_time'],
-                    'copyright_status': row['copyright_status'],
-                    'authors': row['authors'].split(',') if row['authors'] else [],
-                    'age_min': row['age_min'],
-                    'age_max': row['age_max'],
-                    'themes': row['themes'].split(',') if row['themes'] else []
-                }
-                stories.append(story)
+            while True:
+                batch = cursor.fetchmany(256)
+                if not batch:
+                    break
+                stories.extend(row_to_dict(row, include_content) for row in batch)
             
             return stories
     
+    @staticmethod
+    def _names(names_json: Optional[str]) -> List[str]:
+        """Decode a denormalized name list, skipping the parser for empty ones"""
+        if not names_json or names_json == '[]':
+            return []
+        return json.loads(names_json)
+    
+    @classmethod
+    def _row_to_dict(cls, row: sqlite3.Row, include_content: bool = True) -> Dict[str, Any]:
+        """Shape a stories row (see _SEARCH_QUERY) into the public story dict"""
+        story = {
+            'story_id': row['story_id'],
+            'title': row['title'],
+            'word_count': row['word_count'],
+            'estimated_reading_time': row['estimated_reading_time'],
+            'copyright_status': row['copyright_status'],
+            'authors': cls._names(row['authors_json']),
+            'age_min': row['age_min'],
+            'age_max': row['age_max'],
+            'themes': cls._names(row['themes_json'])
+        }
+        if include_content:
+            story['content'] = row['content']
+        return story
+    
     def get_story_by_id(self, story_id: int) -> Optional[Dict[str, Any]]:
         """Get a complete story by ID"""
-        stories = self.search_stories()
-        for story in stories:
-            if story['story_id'] == story_id:
-                return story
-        return None
-    
-    def update_story_stats(self, story_id: int, requested: bool = True, 
-                          completed: bool = False, rating: Optional[int] = None):
-        """Update story usage statistics"""
         with self.get_connection() as conn:
-            # Get current stats
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM story_stats WHERE story_id = ?", (story_id,))
-            row = cursor.fetchone()
+            row = conn.execute("""
+                SELECT s.story_id, s.title, s.word_count, 
+                       s.estimated_reading_time, s.copyright_status,
+                       s.age_min, s.age_max, s.authors_json, s.themes_json, c.content
+                FROM stories s
+                LEFT JOIN story_content c ON s.story_id = c.story_id
+                WHERE s.story_id = ?
+            """, (story_id,)).fetchone()
             
             if not row:
-                # Create new stats record
-                cursor.execute("""
-                    INSERT INTO story_stats (story_id, times_requested, times_completed)
-                    VALUES (?, ?, ?)
-                """, (story_id, 1 if requested else 0, 1 if completed else 0))
-            else:
-                # Update existing stats
-                updates = []
-                params = []
-                
-                if requested:
-                    updates.append("times_requested = times_requested + 1")
-                    updates.append("last_requested = CURRENT_TIMESTAMP")
-                
-                if completed:
-                    updates.append("times_completed = times_completed + 1")
-                
-                if rating is not None:
-                    # Simplified rating update (would need more complex logic for proper averages)
-                    updates.append("average_rating = ?")
-                    updates.append("total_ratings = total_ratings + 1")
-                    params.extend([rating])
-                
-                if updates:
-                    params.append(story_id)
-                    query = f"UPDATE story_stats SET {', '.join(updates)} WHERE story_id = ?"
-                    cursor.execute(query, params)
+                return None
             
-            conn.commit()
+            return self._row_to_dict(row)
+    
+    # Single UPSERT; the running rating average is maintained in SQL
+    # (SET expressions see the pre-update row, so total_ratings is the old count)
+    _UPSERT_STORY_STATS_SQL = """
+        INSERT INTO story_stats (story_id, times_requested, times_completed,
+                                 average_rating, total_ratings, last_requested)
+        VALUES (:story_id, :requested, :completed, COALESCE(:rating, 0.0), :rated,
+                CASE WHEN :requested THEN CURRENT_TIMESTAMP END)
+        ON CONFLICT(story_id) DO UPDATE SET
+            times_requested = times_requested + excluded.times_requested,
+            times_completed = times_completed + excluded.times_completed,
+            average_rating = CASE 
+                WHEN :rating IS NULL THEN average_rating
+                ELSE (COALESCE(average_rating, 0.0) * total_ratings + :rating)
+                     / (total_ratings + 1.0)
+            END,
+            total_ratings = total_ratings + excluded.total_ratings,
+            last_requested = COALESCE(excluded.last_requested, last_requested),
+            updated_at = CURRENT_TIMESTAMP
+    """
+    
+    def update_story_stats(self, story_id: int, requested: bool = True, 
+                          completed: bool = False, rating: Optional[int] = None):
+        """Update story usage statistics"""
+        with self.transaction() as conn:
+            conn.execute(self._UPSERT_STORY_STATS_SQL, {
+                'story_id': story_id,
+                'requested': 1 if requested else 0,
+                'completed': 1 if completed else 0,
+                'rating': rating,
+                'rated': 0 if rating is None else 1
+            })
     
     def get_popular_stories(self, age: Optional[int] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most popular stories by request count"""
-        query = """
-            SELECT s.story_id, s.title, ss.times_requested, ss.average_rating
-            FROM stories s
-            JOIN story_stats ss ON s.story_id = ss.story_id
-            LEFT JOIN reading_levels rl ON s.story_id = rl.story_id
-            WHERE ss.times_requested > 0
-        """
-        
-        params = []
+        return self._cached_read(('popular', age, limit),
+                                 lambda: self._query_popular_stories(age, limit))
+    
+    _POPULAR_QUERY = """
+        SELECT s.story_id, s.title, ss.times_requested, ss.average_rating
+        FROM stories s
+        JOIN story_stats ss ON s.story_id = ss.story_id
+        WHERE ss.times_requested > 0{age_filter}
+        ORDER BY ss.times_requested DESC, ss.average_rating DESC LIMIT ?
+    """
+    _POPULAR_AGE_FILTER = " AND s.age_min <= ? AND s.age_max >= ?"
+    
+    def _query_popular_stories(self, age: Optional[int], limit: int) -> List[Dict[str, Any]]:
         if age is not None:
-            query += " AND rl.age_min <= ? AND rl.age_max >= ?"
-            params.extend([age, age])
-        
-        query += " ORDER BY ss.times_requested DESC, ss.average_rating DESC LIMIT ?"
-        params.append(limit)
+            query = self._POPULAR_QUERY.format(age_filter=self._POPULAR_AGE_FILTER)
+            params = [age, age, limit]
+        else:
+            query = self._POPULAR_QUERY.format(age_filter='')
+            params = [limit]
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
+    _STATS_QUERY = "SELECT key, value FROM meta_counters WHERE value > 0"
+    
     def get_database_stats(self) -> Dict[str, Any]:
-        """Get database statistics"""
+        """Get database statistics from the trigger-maintained counters"""
+        return self._cached_read(('stats',), self._query_database_stats)
+    
+    def _query_database_stats(self) -> Dict[str, Any]:
+        stats = {
+            'total_stories': 0,
+            'total_authors': 0,
+            'by_copyright': {},
+            'by_age_group': {}
+        }
+        
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            stats = {}
-            
-            # Story count
-            cursor.execute("SELECT COUNT(*) FROM stories")
-            stats['total_stories'] = cursor.fetchone()[0]
-            
-            # Author count
-            cursor.execute("SELECT COUNT(*) FROM authors")
-            stats['total_authors'] = cursor.fetchone()[0]
-            
-            # Stories by copyright status
-            cursor.execute("""
-                SELECT copyright_status, COUNT(*) 
-                FROM stories 
-                GROUP BY copyright_status
-            """)
-            stats['by_copyright'] = dict(cursor.fetchall())
-            
-            # Stories by age range
-            cursor.execute("""
-                SELECT 
-                    CASE 
-                        WHEN age_min <= 4 THEN 'Preschool (2-4)'
-                        WHEN age_min <= 6 THEN 'Early Elementary (5-6)'
-                        WHEN age_min <= 8 THEN 'Elementary (7-8)'
-                        WHEN age_min <= 10 THEN 'Middle Elementary (9-10)'
-                        ELSE 'Advanced (11+)'
-                    END as age_group,
-                    COUNT(*)
-                FROM reading_levels 
-                GROUP BY age_group
-            """)
-            stats['by_age_group'] = dict(cursor.fetchall())
-            
-            return stats
+            for key, value in conn.execute(self._STATS_QUERY):
+                group, _, name = key.partition(':')
+                if name:
+                    stats[f'by_{group}'][name] = value
+                else:
+                    stats[key] = value
+        
+        return stats
 
 def seed_sample_stories(db: StoryDatabase):
-    """Seed the database with sample public domain stories including multilingual content"""
+    """Seed the database with sample public domain stories including multilingual content
     
-    # Sample public domain stories (English and Spanish versions)
-    sample_stories = [
-        {
-            'title': 'The Three Little Pigs',
-            'content': """Once upon a time, there were three little pigs who went out into the world to build their own homes.
-
-The first little pig was lazy. He built his house out of straw because it was easy and quick. "This will do just fine," he said.
-
-The second little pig worked a bit harder. He built his house out of sticks. "This is stronger than straw," he thought.
-
-The third little pig was very hardworking. He built his house out of bricks, working all day long. "This will keep me safe," he said.
-
-One day, a big bad wolf came along. He smelled the pigs and decided he wanted them for dinner.
-
-First, he went to the straw house. "Little pig, little pig, let me come in!"
-
-"Not by the hair of my chinny-chin-chin!" said the first pig.
-
-"Then I'll huff and I'll puff and I'll blow your house in!" The wolf blew the straw house down, but the pig ran to his brother's stick house.
-
-The wolf followed. "Little pigs, little pigs, let me come in!"
-
-"Not by the hair of our chinny-chin-chins!"
-
-"Then I'll huff and I'll puff and I'll blow your house in!" The wolf blew the stick house down too, but both pigs ran to their brother's brick house.
-
-The wolf tried to blow down the brick house, but he couldn't. He huffed and puffed until he was tired.
-
-The three little pigs were safe in the strong brick house. They learned that hard work and planning ahead keep you safe. And they all lived happily ever after.""",
-            'copyright_status': 'public_domain',
-            'publication_year': 1840,
-            'source_attribution': 'Traditional English folk tale',
-            'language_code': 'en'
-        },
-        
-        {
-            'title': 'Los Tres Cerditos',
-            'content': """Había una vez tres cerditos que salieron al mundo para construir sus propias casas.
-
-El primer cerdito era perezoso. Construyó su casa de paja porque era fácil y rápido. "Esto estará bien," dijo.
-
-El segundo cerdito trabajó un poco más duro. Construyó su casa de palos. "Esto es más fuerte que la paja," pensó.
-
-El tercer cerdito era muy trabajador. Construyó su casa de ladrillos, trabajando todo el día. "Esto me mantendrá seguro," dijo.
-
-Un día, llegó un lobo feroz. Olió a los cerditos y decidió que los quería para la cena.
-
-Primero, fue a la casa de paja. "¡Cerdito, cerdito, déjame entrar!"
-
-"¡No, por los pelos de mi barbilla!" dijo el primer cerdito.
-
-"¡Entonces soplaré y resoplaré y tu casa derribaré!" El lobo derribó la casa de paja, pero el cerdito corrió a la casa de palos de su hermano.
-
-El lobo lo siguió. "¡Cerditos, cerditos, déjenme entrar!"
-
-"¡No, por los pelos de nuestras barbillas!"
-
-"¡Entonces soplaré y resoplaré y su casa derribaré!" El lobo también derribó la casa de palos, pero ambos cerditos corrieron a la casa de ladrillos de su hermano.
-
-El lobo trató de derribar la casa de ladrillos, pero no pudo. Sopló y resopló hasta que se cansó.
-
-Los tres cerditos estaban seguros en la casa fuerte de ladrillos. Aprendieron que el trabajo duro y la planificación los mantienen seguros. Y vivieron felices para siempre.""",
-            'copyright_status': 'public_domain',
-            'publication_year': 1840,
-            'source_attribution': 'Cuento tradicional inglés',
-            'language_code': 'es'
-        },
-        
-        {
-            'title': 'The Tortoise and the Hare',
-            'content': """Once upon a time, there was a speedy hare who bragged about how fast he could run. Tired of hearing him boast, a tortoise challenged him to a race.
-
-All the animals in the forest gathered to watch. The hare laughed at the tortoise. "This will be the easiest race I've ever won," he said.
-
-The race began and the hare darted almost out of sight at once. Soon he was far ahead of the tortoise.
-
-"This is too easy," thought the hare. "I have plenty of time." He decided to take a nap under a shady tree.
-
-Meanwhile, the tortoise kept walking slowly but steadily. Step by step, he moved forward without stopping. He passed the sleeping hare and continued toward the finish line.
-
-The hare woke up and realized the tortoise was almost at the finish line! He ran as fast as he could, but it was too late. The tortoise had won the race!
-
-All the animals cheered for the tortoise. The hare learned an important lesson that day: "Slow and steady wins the race." Hard work and determination are more important than just being fast.""",
-            'copyright_status': 'public_domain',
-            'source_attribution': 'Aesop\'s Fables',
-            'language_code': 'en'
-        },
-        
-        {
-            'title': 'La Tortuga y la Liebre',
-            'content': """Había una vez una liebre muy rápida que se jactaba de lo rápido que podía correr. Cansada de escucharla presumir, una tortuga la desafió a una carrera.
-
-Todos los animales del bosque se reunieron para ver. La liebre se rió de la tortuga. "Esta será la carrera más fácil que haya ganado," dijo.
-
-La carrera comenzó y la liebre salió disparada casi fuera de vista. Pronto estaba muy por delante de la tortuga.
-
-"Esto es muy fácil," pensó la liebre. "Tengo mucho tiempo." Decidió tomar una siesta bajo un árbol con sombra.
-
-Mientras tanto, la tortuga siguió caminando lenta pero constantemente. Paso a paso, se movía hacia adelante sin parar. Pasó a la liebre dormida y continuó hacia la línea de meta.
-
-¡La liebre se despertó y se dio cuenta de que la tortuga estaba casi en la línea de meta! Corrió tan rápido como pudo, pero era demasiado tarde. ¡La tortuga había ganado la carrera!
-
-Todos los animales vitorearon a la tortuga. La liebre aprendió una lección importante ese día: "Lento y constante gana la carrera." El trabajo duro y la determinación son más importantes que ser rápido.""",
-            'copyright_status': 'public_domain',
-            'source_attribution': 'Fábulas de Esopo',
-            'language_code': 'es'
-        }
-    ]
-    
-    # Add sample authors
-    authors = [
-        {'name': 'Traditional Folk Tales', 'nationality': 'Various'},
-        {'name': 'Aesop', 'birth_year': -620, 'death_year': -564, 'nationality': 'Greek'}
-    ]
-    
-    author_ids = {}
-    for author_data in authors:
-        author_id = db.add_author(**author_data)
-        author_ids[author_data['name']] = author_id
-    
-    # Add stories with metadata
-    for i, story_data in enumerate(sample_stories):
-        story_id = db.add_story(story_data)
-        
-        # Link to author
-        if i == 0:  # Three Little Pigs
-            db.link_story_author(story_id, author_ids['Traditional Folk Tales'])
-            db.set_reading_level(story_id, 3, 7, grade_min=1, grade_max=3)
-            db.add_theme_to_story(story_id, 'Hard Work', 'moral', 8)
-            db.add_theme_to_story(story_id, 'Animals', 'subject', 7)
-            db.add_theme_to_story(story_id, 'Safety', 'moral', 6)
-            
-        else:  # Tortoise and Hare
-            db.link_story_author(story_id, author_ids['Aesop'])
-            db.set_reading_level(story_id, 4, 8, grade_min=2, grade_max=4)
-            db.add_theme_to_story(story_id, 'Perseverance', 'moral', 9)
-            db.add_theme_to_story(story_id, 'Animals', 'subject', 8)
-            db.add_theme_to_story(story_id, 'Competition', 'social_emotional', 5)
+    The rows live in seed.sql, loaded with one executescript call. The script
+    runs its own BEGIN IMMEDIATE transaction and only inserts into a library
+    with no stories yet. executescript commits any open transaction first, so
+    do not call this inside db.transaction().
+    """
+    with open(SEED_SQL_PATH, encoding='utf-8') as f:
+        seed_sql = f.read()
+    
+    with db.get_connection() as conn:
+        changes_before = conn.total_changes
+        conn.executescript(seed_sql)
+        if conn.total_changes == changes_before:
+            logger.info("Stories already present; skipping sample seed")
+            return
+        
+        # Refresh planner statistics now that the tables hold real data
+        conn.execute("ANALYZE")
+    db._read_cache.clear()
     
     logger.info("Sample stories seeded successfully")
\ No newline at end of file
@@ -3,8 +3,14 @@
 StoryLine AI - Trust But Verify Integration Core
 """
 
+import json
+import time
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import functools
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -12,10 +18,28 @@ from config import get_config
 from analytics_engine import get_analytics_engine
 from validation_layer import get_validation_layer
 from quality_assurance import get_automated_qa
-from realtime_verification import get_realtime_verification
+from realtime_verification import get_realtime_verification, VerificationStatus
 
 logger = logging.getLogger(__name__)
 
+# Verification results kept for repeated identical payloads
+VERIFY_CACHE_SIZE = 4096
+VERIFY_CACHE_TTL_SECONDS = 60.0
+
+# How long a computed SystemStatus answers health polls
+STATUS_CACHE_TTL_SECONDS = 2.0
+
+# (epoch seconds, ISO string) of the last formatted timestamp
+_iso_cache = [0.0, ""]
+
+def _iso_now() -> str:
+    """Current local time in ISO format, reformatted at most once per second"""
+    now = time.time()
+    if now - _iso_cache[0] >= 1.0:
+        _iso_cache[0] = now
+        _iso_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _iso_cache[1]
+
 @dataclass
 class SystemStatus:
     """System status summary"""
@@ -33,11 +57,27 @@ class TrustButVerifyCore:
     """Core Trust But Verify functionality"""
     
     def __init__(self):
-        self.analytics = get_analytics_engine()
-        self.validator = get_validation_layer()
-        self.qa_system = get_automated_qa()
-        self.realtime = get_realtime_verification()
         self._initialized = False
+        self._verify_cache: OrderedDict = OrderedDict()
+        self._verify_cache_lock = threading.Lock()
+        self._status_cache: Optional[Tuple[float, 'SystemStatus']] = None
+    
+    # Subsystems are fetched on first use rather than at import time
+    @functools.cached_property
+    def analytics(self):
+        return get_analytics_engine()
+    
+    @functools.cached_property
+    def validator(self):
+        return get_validation_layer()
+    
+    @functools.cached_property
+    def qa_system(self):
+        return get_automated_qa()
+    
+    @functools.cached_property
+    def realtime(self):
+        return get_realtime_verification()
     
     def initialize(self):
         """Initialize the system"""
@@ -55,13 +95,58 @@ class TrustButVerifyCore:
         self._initialized = True
         logger.info("Trust But Verify Core initialized")
     
+    @staticmethod
+    def _verify_key(interface: str, data_type: str, payload: Dict[str, Any]) -> Optional[bytes]:
+        """Hash of the canonicalized payload, scoped to interface and data type;
+        None if the payload is not plain JSON (it is then not cached)"""
+        try:
+            # No default=: a non-JSON value must not hash like its string form
+            canonical = json.dumps([interface, data_type, payload], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+    
     def verify_data(self, interface: str, data_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Verify data across all systems"""
-        # Real-time verification
-        rt_result = self.realtime.verify_realtime(data_type, payload)
+        """Verify data across all systems
         
-        # Validation
-        val_result = self.validator.validate_interface_data(interface, payload)
+        Identical payloads reuse a recent deterministic verification outcome;
+        timeouts and verification errors are always retried. The event is
+        still tracked on every call.
+        """
+        key = self._verify_key(interface, data_type, payload)
+        outcome = None
+        if key is not None:
+            now = time.monotonic()
+            with self._verify_cache_lock:
+                entry = self._verify_cache.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        outcome = entry[1]
+                        self._verify_cache.move_to_end(key)
+                    else:
+                        del self._verify_cache[key]
+        
+        if outcome is None:
+            # Real-time verification
+            rt_result = self.realtime.verify_realtime(data_type, payload)
+            
+            # Validation
+            val_result = self.validator.validate_interface_data(interface, payload)
+            
+            outcome = {
+                'verified': rt_result.verification_status.value == 'verified',
+                'validation_passed': val_result.is_valid,
+                'confidence': min(rt_result.confidence_score, val_result.confidence_score),
+                'errors': list(val_result.errors)
+            }
+            transient = (rt_result.verification_status in (VerificationStatus.TIMEOUT, VerificationStatus.PENDING)
+                         or 'verification_error' in rt_result.alerts_triggered
+                         or 'validation_error' in rt_result.alerts_triggered)
+            if key is not None and not transient:
+                with self._verify_cache_lock:
+                    self._verify_cache[key] = (time.monotonic() + VERIFY_CACHE_TTL_SECONDS, outcome)
+                    if len(self._verify_cache) > VERIFY_CACHE_SIZE:
+                        self._verify_cache.popitem(last=False)
         
         # Track event
         self.analytics.track_event(
@@ -72,15 +157,23 @@ class TrustButVerifyCore:
         )
         
         return {
-            'verified': rt_result.verification_status.value == 'verified',
-            'validation_passed': val_result.is_valid,
-            'confidence': min(rt_result.confidence_score, val_result.confidence_score),
-            'errors': val_result.errors,
-            'timestamp': datetime.now().isoformat()
+            **outcome,
+            'errors': list(outcome['errors']),
+            'timestamp': _iso_now()
         }
     
     def get_status(self) -> SystemStatus:
-        """Get system status"""
+        """Get system status, recomputed at most every STATUS_CACHE_TTL_SECONDS"""
+        cached = self._status_cache
+        now = time.monotonic()
+        if cached is not None and now < cached[0]:
+            return cached[1]
+        
+        status = self._compute_status()
+        self._status_cache = (now + STATUS_CACHE_TTL_SECONDS, status)
+        return status
+    
+    def _compute_status(self) -> SystemStatus:
         qa_summary = self.qa_system.get_qa_summary()
         rt_metrics = self.realtime.get_verification_metrics(60)
         alerts = self.realtime.get_active_alerts()
@@ -90,7 +183,7 @@ class TrustButVerifyCore:
             verification_rate=rt_metrics.get('success_rate', 0.95),
             quality_score=qa_summary.get('latest_quality_score', 0.8),
             active_alerts=len(alerts),
-            last_check=datetime.now().isoformat()
+            last_check=_iso_now()
         )
 
 # Global instance
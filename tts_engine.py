@@ -5,17 +5,126 @@ Implements smart TTS selection based on budget and quality needs
 """
 
 import os
+import re
+import mmap
+import socket
 import subprocess
 import tempfile
 import json
+import string
+import time
+import queue
+import shutil
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from enum import Enum
-from typing import Optional, Dict, Any, Tuple
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, BinaryIO, Iterator, List, Tuple, Union
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 
+try:
+    import orjson  # Faster usage-file (de)serialization when installed
+except ImportError:
+    orjson = None
+
+try:
+    from AppKit import NSSpeechSynthesizer  # In-process macOS speech via PyObjC
+    from Foundation import NSURL
+except ImportError:
+    NSSpeechSynthesizer = None
+
 logger = logging.getLogger(__name__)
 
+# How often pending usage counters are written to the usage file
+USAGE_FLUSH_SECONDS = 5.0
+
+# Consecutive stdout renders that fail while the temp-file render of the same text
+# works, before say is taken to be unable to write to a pipe here
+SAY_STDOUT_MAX_FAILURES = 3
+
+# Long-lived shell workers that run say for each request line ("voice<TAB>rate<TAB>text")
+# and reply with the AIFF size on one line followed by the audio bytes (size 0 on failure)
+SAY_POOL_SIZE = 4
+SAY_WORKER_SCRIPT = r"""
+dir=$(mktemp -d) || exit 1
+trap 'rm -rf "$dir"' EXIT
+while IFS=$'\t' read -r voice rate text; do
+    if say -v "$voice" -r "$rate" -o "$dir/out.aiff" "$text" 2>/dev/null; then
+        wc -c < "$dir/out.aiff" | tr -d ' '
+        cat "$dir/out.aiff"
+    else
+        echo 0
+    fi
+done
+"""
+
+# Reusable read buffers for synthesize_speech_pooled, created on demand
+AUDIO_BUFFER_SIZE = 1 << 20
+AUDIO_BUFFER_POOL_SIZE = 8
+_audio_buffers: queue.Queue = queue.Queue(maxsize=AUDIO_BUFFER_POOL_SIZE)
+
+class PooledAudio:
+    """Audio held in a pooled bytearray; use as a context manager
+    
+    Entering yields a memoryview of the audio. The buffer goes back to the
+    pool on exit, so the view must not be used afterwards.
+    """
+    
+    __slots__ = ('_buffer', '_length', '_view')
+    
+    def __init__(self, buffer: bytearray, length: int):
+        self._buffer = buffer
+        self._length = length
+        self._view = None
+    
+    @classmethod
+    def read_file(cls, audio_file: BinaryIO) -> 'PooledAudio':
+        """Read a whole file into a pooled buffer"""
+        try:
+            buffer = _audio_buffers.get_nowait()
+        except queue.Empty:
+            buffer = bytearray(AUDIO_BUFFER_SIZE)
+        
+        size = os.fstat(audio_file.fileno()).st_size
+        if len(buffer) < size:
+            buffer.extend(bytes(size - len(buffer)))
+        
+        length = 0
+        with memoryview(buffer) as view:
+            while length < size:
+                read = audio_file.readinto(view[length:size])
+                if not read:
+                    break
+                length += read
+        return cls(buffer, length)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __enter__(self) -> memoryview:
+        self._view = memoryview(self._buffer)[:self._length]
+        return self._view
+    
+    def __exit__(self, *exc_info):
+        self._view.release()
+        buffer, self._buffer = self._buffer, None
+        # Oversized buffers from unusually long audio are not kept
+        if buffer is not None and len(buffer) == AUDIO_BUFFER_SIZE:
+            try:
+                _audio_buffers.put_nowait(buffer)
+            except queue.Full:
+                pass
+
+# Sentence boundaries used to split long text for streamed synthesis
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+WHITESPACE_RUN = re.compile(r'\s+')
+EDGE_CHARACTERS = string.punctuation + string.whitespace
+
 class TTSProvider(Enum):
     """Available TTS providers with cost implications"""
     LOCAL_SAY = "local_say"           # macOS built-in (FREE)
@@ -25,15 +134,16 @@ class TTSProvider(Enum):
     ELEVENLABS = "elevenlabs"         # ElevenLabs ($5-99/month)
     AZURE = "azure"                   # Azure Speech ($4/1M chars)
 
-@dataclass
+@dataclass(slots=True)
 class TTSUsage:
     """Track TTS usage for cost management"""
     characters_used: int = 0
     api_calls_made: int = 0
     current_spend: float = 0.0
     last_reset: str = ""
+    cache_hits: int = 0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VoiceProfile:
     """Voice configuration for different story types"""
     name: str
@@ -42,6 +152,11 @@ class VoiceProfile:
     rate: int = 150  # Words per minute
     pitch: int = 50  # Pitch adjustment
     suitable_for: list = None
+    # Invariant head of the say command line for this voice
+    say_prefix: tuple = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'say_prefix', ("say", "-v", self.voice_id, "-r", str(self.rate)))
 
 class CostOptimizedTTS:
     """Smart TTS engine that minimizes costs while maintaining quality"""
@@ -54,10 +169,63 @@ class CostOptimizedTTS:
         # Load usage tracking
         self.usage_file = "tts_usage.json"
         self.usage = self._load_usage()
+        self._usage_lock = threading.Lock()
+        
+        # Usage is written at most every USAGE_FLUSH_SECONDS, plus once at exit
+        self._usage_dirty = False
+        threading.Thread(target=self._flush_usage_loop, daemon=True).start()
+        atexit.register(self._flush_usage)
+        
+        # Synthesized audio, content-addressed so repeated prompts skip TTS entirely
+        self.cache_dir = Path(os.getenv('TTS_CACHE_DIR', 'tts_cache'))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 'aac' stores and returns ADTS AAC (~10x smaller than AIFF) via macOS afconvert
+        self.audio_format = os.getenv('TTS_CACHE_FORMAT', 'aiff').lower()
+        if self.audio_format == 'aac' and not shutil.which('afconvert'):
+            logger.warning("afconvert not found; caching uncompressed AIFF")
+            self.audio_format = 'aiff'
+        
+        # LRU index over the cache: key -> (path, size, last access), oldest first
+        self._lru: OrderedDict = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_limit = int(os.getenv('TTS_CACHE_MB', '100')) * 1024 * 1024
+        self._cache_lock = threading.Lock()
+        self._cache_index_file = self.cache_dir / "cache_index.json"
+        
+        # Near-match key (case/spacing/edge punctuation folded) -> exact key holding the audio
+        self._near_keys: Dict[str, str] = {}
+        self._near_keys_file = self.cache_dir / "near_keys.json"
+        
+        # Cache keys currently being synthesized -> set once their audio is cached
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+        self._load_cache_index()
+        atexit.register(self._save_cache_index)
+        
+        # In-process synthesizers (PyObjC), one voice id -> synthesizer map per thread
+        # so concurrent renders never share or wait on a synthesizer
+        self._native_synths = threading.local()
+        
+        # say streams AIFF to stdout unless that turns out not to work here
+        self._say_to_stdout = True
+        self._say_stdout_failures = 0
+        
+        # Warm say workers, started on first local synthesis
+        self._say_pool: Optional[queue.Queue] = None
+        self._say_pool_lock = threading.Lock()
         
         # Voice profiles for different scenarios
         self.voice_profiles = self._setup_voice_profiles()
         
+        # Provider -> synthesis method
+        self._dispatch = {
+            TTSProvider.LOCAL_SAY: self._local_macos_tts,
+            TTSProvider.GOOGLE_FREE: self._google_tts,
+            TTSProvider.AMAZON_FREE: self._amazon_tts,
+            TTSProvider.OPENAI: self._openai_tts
+        }
+        
         # Provider cost per 1M characters
         self.provider_costs = {
             TTSProvider.LOCAL_SAY: 0.0,
@@ -74,29 +242,76 @@ class CostOptimizedTTS:
             TTSProvider.AMAZON_FREE: 5_000_000,
             TTSProvider.AZURE: 500_000
         }
+        
+        # Selection tables derived once from the settings above
+        self._cost_per_char = {provider: cost / 1_000_000 for provider, cost in self.provider_costs.items()}
+        self._default_profile = self.voice_profiles["narrator_female"]
+        self._local_testing = self.testing_mode == 'local_tts'
+        self._decision_table = self._build_decision_table()
+    
+    def _build_decision_table(self) -> Tuple[tuple, ...]:
+        """(predicate, choice) rows for paid/free-tier selection, first match wins
+        
+        Predicates take (quality, characters_used, current_spend, text_length).
+        """
+        premium = self.voice_profiles["premium_female"]
+        google_free_limit = self.free_tier_limits[TTSProvider.GOOGLE_FREE]
+        openai_cost_per_char = self._cost_per_char.get(TTSProvider.OPENAI, 0)
+        budget = self.monthly_budget
+        
+        return (
+            # Google's free tier covers good/premium requests while it lasts
+            (lambda quality, used, spend, length: quality in ("good", "premium") and used < google_free_limit,
+             (TTSProvider.GOOGLE_FREE, premium)),
+            # Paid premium only when the estimate still fits the budget
+            (lambda quality, used, spend, length: quality == "premium"
+                 and spend + length * openai_cost_per_char <= budget,
+             (TTSProvider.OPENAI, premium)),
+        )
     
     def _load_usage(self) -> TTSUsage:
         """Load usage tracking from file"""
         try:
             if os.path.exists(self.usage_file):
-                with open(self.usage_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.usage_file, 'rb') as f:
+                    data = orjson.loads(f.read()) if orjson else json.load(f)
                     return TTSUsage(**data)
         except Exception as e:
             logger.warning(f"Could not load usage data: {e}")
         
         return TTSUsage(last_reset=datetime.now().strftime("%Y-%m"))
     
+    def _flush_usage_loop(self):
+        while True:
+            time.sleep(USAGE_FLUSH_SECONDS)
+            self._flush_usage()
+    
+    def _flush_usage(self):
+        """Write usage to disk if it changed since the last write"""
+        with self._usage_lock:
+            if self._usage_dirty:
+                self._save_usage()
+    
     def _save_usage(self):
-        """Save usage tracking to file"""
+        """Save usage tracking to file (atomically, via a temp file)"""
+        temp_path = f"{self.usage_file}.tmp"
         try:
-            with open(self.usage_file, 'w') as f:
-                json.dump({
-                    'characters_used': self.usage.characters_used,
-                    'api_calls_made': self.usage.api_calls_made,
-                    'current_spend': self.usage.current_spend,
-                    'last_reset': self.usage.last_reset
-                }, f, indent=2)
+            data = {
+                'characters_used': self.usage.characters_used,
+                'api_calls_made': self.usage.api_calls_made,
+                'current_spend': self.usage.current_spend,
+                'last_reset': self.usage.last_reset,
+                'cache_hits': self.usage.cache_hits
+            }
+            # Compact output: the file is rewritten often and never hand-edited
+            if orjson:
+                with open(temp_path, 'wb') as f:
+                    f.write(orjson.dumps(data))
+            else:
+                with open(temp_path, 'w') as f:
+                    f.write(json.dumps(data, separators=(',', ':')))
+            os.replace(temp_path, self.usage_file)
+            self._usage_dirty = False
         except Exception as e:
             logger.warning(f"Could not save usage data: {e}")
     
@@ -139,79 +354,519 @@ class CostOptimizedTTS:
         text_length = len(text)
         
         # Always use free local for basic testing
-        if self.testing_mode == 'local_tts' or quality_needed == "test":
-            profile = self.voice_profiles.get(voice_type, self.voice_profiles["narrator_female"])
+        if self._local_testing or quality_needed == "test":
+            profile = self.voice_profiles.get(voice_type, self._default_profile)
             if profile.provider == TTSProvider.LOCAL_SAY:
                 return TTSProvider.LOCAL_SAY, profile
         
         # Check monthly budget constraints
         if self.usage.current_spend >= self.monthly_budget:
             logger.info("Monthly budget exceeded, falling back to local TTS")
-            return TTSProvider.LOCAL_SAY, self.voice_profiles["narrator_female"]
-        
-        # Check free tier availability
-        for provider, limit in self.free_tier_limits.items():
-            if self.usage.characters_used < limit:
-                # Use free tier
-                if provider == TTSProvider.GOOGLE_FREE and quality_needed in ["good", "premium"]:
-                    return provider, self.voice_profiles["premium_female"]
-        
-        # Calculate cost for paid services
-        cost_per_char = self.provider_costs.get(TTSProvider.OPENAI, 0) / 1_000_000
-        estimated_cost = text_length * cost_per_char
+            return TTSProvider.LOCAL_SAY, self._default_profile
         
-        if quality_needed == "premium" and self.usage.current_spend + estimated_cost <= self.monthly_budget:
-            return TTSProvider.OPENAI, self.voice_profiles["premium_female"]
+        # Free tier, then paid premium
+        used, spend = self.usage.characters_used, self.usage.current_spend
+        for predicate, choice in self._decision_table:
+            if predicate(quality_needed, used, spend, text_length):
+                return choice
         
         # Fallback to local
-        return TTSProvider.LOCAL_SAY, self.voice_profiles[voice_type]
+        return TTSProvider.LOCAL_SAY, self.voice_profiles.get(voice_type, self._default_profile)
     
     def synthesize_speech(self, text: str, voice_type: str = "narrator_female", 
                          quality: str = "basic") -> Optional[bytes]:
         """Generate speech audio with cost optimization"""
         provider, voice_profile = self.select_optimal_provider(text, quality, voice_type)
         
+        cache_key = self._cache_key(text, provider, voice_profile)
+        near_key = self._near_key(text, provider, voice_profile)
+        cached_audio = self._cached_hit(cache_key, near_key, text)
+        if cached_audio is not None:
+            return cached_audio
+        
+        # Only one caller synthesizes a given key; the rest wait for its cache write
+        with self._inflight_lock:
+            done = self._inflight.get(cache_key)
+            leader = done is None
+            if leader:
+                done = self._inflight[cache_key] = threading.Event()
+        
+        if not leader:
+            done.wait()
+            cached_audio = self._cached_hit(cache_key, near_key, text)
+            if cached_audio is not None:
+                return cached_audio
+            # The leader failed or produced nothing cacheable; try ourselves
+            return self._synthesize_uncached(text, provider, voice_profile, cache_key, near_key)
+        
+        try:
+            return self._synthesize_uncached(text, provider, voice_profile, cache_key, near_key)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+            done.set()
+    
+    def _cached_hit(self, cache_key: str, near_key: str, text: str) -> Optional[bytes]:
+        """Cached audio for the exact or near-match key, counted as a cache hit, or None"""
+        cached_audio = self._read_cached_audio(cache_key)
+        if cached_audio is None:
+            near_match = self._near_keys.get(near_key)
+            if near_match is not None:
+                cached_audio = self._read_cached_audio(near_match)
+        if cached_audio is not None:
+            logger.debug(f"TTS cache hit for {len(text)} characters")
+            with self._usage_lock:
+                self.usage.cache_hits += 1
+                self._usage_dirty = True
+        return cached_audio
+    
+    def _synthesize_uncached(self, text: str, provider: TTSProvider,
+                             voice_profile: VoiceProfile, cache_key: str,
+                             near_key: str) -> Optional[bytes]:
+        """Run the selected provider and cache its audio"""
         logger.info(f"Using {provider.value} for TTS ({len(text)} characters)")
         
         try:
-            if provider == TTSProvider.LOCAL_SAY:
-                audio_data = self._local_macos_tts(text, voice_profile)
-            elif provider == TTSProvider.GOOGLE_FREE:
-                audio_data = self._google_tts(text, voice_profile)
-            elif provider == TTSProvider.AMAZON_FREE:
-                audio_data = self._amazon_tts(text, voice_profile)
-            elif provider == TTSProvider.OPENAI:
-                audio_data = self._openai_tts(text, voice_profile)
-            else:
-                # Fallback to local
-                audio_data = self._local_macos_tts(text, voice_profile)
+            # Providers without an implementation fall back to local
+            synthesize = self._dispatch.get(provider, self._local_macos_tts)
+            audio_data = self._encode_audio(synthesize(text, voice_profile))
             
             # Update usage tracking
             self._update_usage(len(text), provider)
             
+            if audio_data:
+                self._store_cached_audio(cache_key, audio_data)
+                with self._cache_lock:
+                    if cache_key in self._lru:
+                        self._near_keys[near_key] = cache_key
+            
             return audio_data
             
         except Exception as e:
             logger.error(f"TTS failed with {provider.value}: {e}")
             # Fallback to local TTS
             if provider != TTSProvider.LOCAL_SAY:
-                return self._local_macos_tts(text, self.voice_profiles["narrator_female"])
+                return self._encode_audio(self._local_macos_tts(text, self._default_profile))
             return None
     
+    def _encode_audio(self, audio_data: bytes) -> bytes:
+        """Convert provider AIFF into the configured audio format"""
+        if self.audio_format != 'aac' or not audio_data:
+            return audio_data
+        return self._afconvert(audio_data, '.aiff', '.aac', ["-f", "adts", "-d", "aac"])
+    
+    def decode_to_aiff(self, audio_data: bytes) -> bytes:
+        """Uncompressed AIFF for clients that need PCM, whatever the audio format"""
+        if self.audio_format != 'aac' or not audio_data:
+            return audio_data
+        return self._afconvert(audio_data, '.aac', '.aiff', ["-f", "AIFF", "-d", "BEI16"])
+    
+    def _afconvert(self, audio_data: bytes, in_suffix: str, out_suffix: str, options: List[str]) -> bytes:
+        """Run afconvert over temp files; returns b"" on failure"""
+        with tempfile.TemporaryDirectory() as work_dir:
+            source = os.path.join(work_dir, f"in{in_suffix}")
+            target = os.path.join(work_dir, f"out{out_suffix}")
+            with open(source, 'wb') as f:
+                f.write(audio_data)
+            try:
+                result = subprocess.run(["afconvert", *options, source, target],
+                                        capture_output=True, text=True, timeout=30)
+            except subprocess.TimeoutExpired:
+                logger.error("afconvert timed out")
+                return b""
+            if result.returncode != 0:
+                logger.error(f"afconvert failed: {result.stderr}")
+                return b""
+            with open(target, 'rb') as f:
+                return f.read()
+    
+    def synthesize_batch(self, texts: List[str], voice_type: str = "narrator_female",
+                        quality: str = "basic") -> List[Optional[bytes]]:
+        """Synthesize several segments concurrently, returning audio in input order"""
+        if not texts:
+            return []
+        
+        max_workers = min(len(texts), os.cpu_count() or 1, 8)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda text: self.synthesize_speech(text, voice_type, quality), texts
+            ))
+    
+    def synthesize_stream(self, text: str, voice_type: str = "narrator_female",
+                          quality: str = "basic") -> Iterator[Optional[bytes]]:
+        """Synthesize text sentence by sentence, yielding audio in order
+        
+        Sentences render concurrently, so the first chunk is ready after one
+        sentence's worth of work instead of the whole text's.
+        """
+        sentences = [sentence for sentence in SENTENCE_BREAK.split(text.strip()) if sentence]
+        if not sentences:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=min(len(sentences), os.cpu_count() or 1, 8))
+        try:
+            futures = [
+                executor.submit(self.synthesize_speech, sentence, voice_type, quality)
+                for sentence in sentences
+            ]
+            for future in futures:
+                yield future.result()
+        finally:
+            # A consumer that stops early should not pay for the remaining sentences
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def synthesize_speech_mmap(self, text: str, voice_type: str = "narrator_female",
+                               quality: str = "basic") -> Optional[Union[mmap.mmap, bytes]]:
+        """Like synthesize_speech, but map the cached audio file instead of copying it
+        
+        The read-only mmap supports the buffer protocol, so it can be written to
+        files or sockets directly. Audio that could not be cached comes back as
+        the bytes synthesize_speech produced.
+        """
+        audio_file, audio_data = self._open_synthesized(text, voice_type, quality)
+        if audio_file is None:
+            return audio_data
+        with audio_file:
+            return mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def synthesize_speech_pooled(self, text: str, voice_type: str = "narrator_female",
+                                 quality: str = "basic") -> Optional[PooledAudio]:
+        """Like synthesize_speech, but read cached audio into a reusable buffer
+        
+        Use as `with tts.synthesize_speech_pooled(text) as audio: sock.sendall(audio)`.
+        """
+        audio_file, audio_data = self._open_synthesized(text, voice_type, quality)
+        if audio_file is None:
+            # Not cacheable; wrap the bytes we have (not returned to the pool)
+            return None if audio_data is None else PooledAudio(bytearray(audio_data), len(audio_data))
+        with audio_file:
+            return PooledAudio.read_file(audio_file)
+    
+    def stream_to_socket(self, text: str, sock: socket.socket, voice_type: str = "narrator_female",
+                         quality: str = "basic") -> int:
+        """Send synthesized audio to a connected socket; returns the bytes sent
+        
+        Cached audio goes out with socket.sendfile(), i.e. sendfile(2) on Linux,
+        so it never passes through Python buffers. Platforms without it fall
+        back to ordinary sends inside sendfile().
+        """
+        audio_file, audio_data = self._open_synthesized(text, voice_type, quality)
+        if audio_file is None:
+            if not audio_data:
+                return 0
+            sock.sendall(audio_data)
+            return len(audio_data)
+        with audio_file:
+            return sock.sendfile(audio_file)
+    
+    def _open_synthesized(self, text: str, voice_type: str,
+                          quality: str) -> Tuple[Optional[BinaryIO], Optional[bytes]]:
+        """Open the cached audio for a request, synthesizing it first on a miss
+        
+        Returns (file, None) when the audio is in the cache, otherwise
+        (None, audio) with whatever synthesize_speech returned.
+        """
+        provider, voice_profile = self.select_optimal_provider(text, quality, voice_type)
+        cache_key = self._cache_key(text, provider, voice_profile)
+        
+        audio_file = self._open_cached_audio(cache_key)
+        if audio_file is None:
+            near_match = self._near_keys.get(self._near_key(text, provider, voice_profile))
+            if near_match is not None:
+                audio_file = self._open_cached_audio(near_match)
+        if audio_file is not None:
+            with self._usage_lock:
+                self.usage.cache_hits += 1
+                self._usage_dirty = True
+            return audio_file, None
+        
+        audio_data = self.synthesize_speech(text, voice_type, quality)
+        audio_file = self._open_cached_audio(self._near_keys.get(
+            self._near_key(text, provider, voice_profile), cache_key))
+        if audio_file is None:
+            return None, audio_data
+        return audio_file, None
+    
+    def _cache_key(self, text: str, provider: TTSProvider, voice_profile: VoiceProfile) -> str:
+        """Cache key for a (provider, voice, rate, text) combination"""
+        return hashlib.blake2b(
+            f"{provider.value}|{voice_profile.voice_id}|{voice_profile.rate}|{text}".encode(),
+            digest_size=16
+        ).hexdigest()
+    
+    def _near_key(self, text: str, provider: TTSProvider, voice_profile: VoiceProfile) -> str:
+        """Cache key for the text with case, spacing and edge punctuation folded away"""
+        normalized = WHITESPACE_RUN.sub(' ', text.lower().strip(EDGE_CHARACTERS))
+        return self._cache_key(normalized, provider, voice_profile)
+    
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.{self.audio_format}"
+    
+    def _load_cache_index(self):
+        """Rebuild the LRU order from the saved index, then any unindexed files by atime"""
+        entries = {}
+        for path in self.cache_dir.glob(f"*.{self.audio_format}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries[path.stem] = (path, stat.st_size, stat.st_atime)
+        
+        order = []
+        try:
+            if self._cache_index_file.exists():
+                with open(self._cache_index_file, 'r') as f:
+                    order = [key for key in json.load(f) if key in entries]
+        except Exception as e:
+            logger.warning(f"Could not load TTS cache index: {e}")
+        
+        indexed = set(order)
+        order += sorted((key for key in entries if key not in indexed), key=lambda key: entries[key][2])
+        
+        for key in order:
+            self._lru[key] = entries[key]
+            self._cache_bytes += entries[key][1]
+        self._evict_cached_audio()
+        
+        try:
+            if self._near_keys_file.exists():
+                with open(self._near_keys_file, 'r') as f:
+                    self._near_keys = {near: key for near, key in json.load(f).items() if key in self._lru}
+        except Exception as e:
+            logger.warning(f"Could not load TTS near-match keys: {e}")
+    
+    def _save_cache_index(self):
+        """Persist the LRU order (oldest first) so it survives restarts"""
+        try:
+            with self._cache_lock:
+                keys = list(self._lru)
+                near_keys = {near: key for near, key in self._near_keys.items() if key in self._lru}
+            with open(self._cache_index_file, 'w') as f:
+                json.dump(keys, f)
+            with open(self._near_keys_file, 'w') as f:
+                json.dump(near_keys, f)
+        except Exception as e:
+            logger.warning(f"Could not save TTS cache index: {e}")
+    
+    def _read_cached_audio(self, key: str) -> Optional[bytes]:
+        """Return cached audio and mark it most recently used, or None on a miss"""
+        audio_file = self._open_cached_audio(key)
+        if audio_file is None:
+            return None
+        with audio_file:
+            return audio_file.read()
+    
+    def _open_cached_audio(self, key: str) -> Optional[BinaryIO]:
+        """Open cached audio and mark it most recently used, or None on a miss"""
+        with self._cache_lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            self._lru[key] = (entry[0], entry[1], time.time())
+            self._lru.move_to_end(key)
+        
+        try:
+            return open(entry[0], 'rb')
+        except OSError:
+            # Removed behind our back; forget it and synthesize again
+            with self._cache_lock:
+                if self._lru.pop(key, None) is not None:
+                    self._cache_bytes -= entry[1]
+            return None
+    
+    def _evict_cached_audio(self):
+        """Drop least recently used files until the cache fits its byte budget"""
+        evicted = False
+        while self._cache_bytes > self._cache_limit and self._lru:
+            _, (path, size, _) = self._lru.popitem(last=False)
+            self._cache_bytes -= size
+            evicted = True
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        if evicted:
+            # Near-match aliases never outlive the audio they point at
+            self._near_keys = {near: key for near, key in self._near_keys.items() if key in self._lru}
+    
+    def _store_cached_audio(self, key: str, audio_data: bytes):
+        """Write audio to the cache atomically so readers never see partial files"""
+        cache_path = self._cache_path(key)
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix='.tmp', delete=False) as temp_file:
+                temp_path = temp_file.name
+                temp_file.write(audio_data)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache TTS audio: {e}")
+            if temp_path:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+            return
+        
+        with self._cache_lock:
+            previous = self._lru.pop(key, None)
+            if previous is not None:
+                self._cache_bytes -= previous[1]
+            self._lru[key] = (cache_path, len(audio_data), time.time())
+            self._cache_bytes += len(audio_data)
+            self._evict_cached_audio()
+    
     def _local_macos_tts(self, text: str, voice_profile: VoiceProfile) -> bytes:
         """Generate speech using macOS built-in TTS (completely free)"""
+        audio_data = self._native_tts(text, voice_profile)
+        if audio_data is not None:
+            return audio_data
+        
+        audio_data = self._pooled_say(text, voice_profile)
+        if audio_data is not None:
+            return audio_data
+        
+        if self._say_to_stdout:
+            try:
+                # Capture the AIFF straight from stdout; no temp file round-trip
+                cmd = (*voice_profile.say_prefix, "--file-format=AIFF", "-o", "/dev/stdout", text)
+                
+                result = subprocess.run(cmd, capture_output=True, timeout=30)
+                
+                if result.returncode == 0 and result.stdout:
+                    self._say_stdout_failures = 0
+                    return result.stdout
+                
+                logger.warning(f"say could not write to stdout, retrying via temp file: "
+                               f"{result.stderr.decode(errors='replace').strip()}")
+                
+            except subprocess.TimeoutExpired:
+                logger.error("TTS generation timed out")
+                return b""
+            except Exception as e:
+                logger.error(f"Local TTS error: {e}")
+                return b""
+            
+            # A bad voice or text fails both ways; only count failures the temp file gets past
+            audio_data = self._local_macos_tts_via_file(text, voice_profile)
+            if audio_data:
+                self._say_stdout_failures += 1
+                if self._say_stdout_failures >= SAY_STDOUT_MAX_FAILURES:
+                    # Some say builds cannot write AIFF to a pipe; stop trying
+                    logger.warning("say repeatedly failed on stdout only; using temp files")
+                    self._say_to_stdout = False
+            return audio_data
+        
+        return self._local_macos_tts_via_file(text, voice_profile)
+    
+    def _native_tts(self, text: str, voice_profile: VoiceProfile) -> Optional[bytes]:
+        """Render with NSSpeechSynthesizer in-process; None when PyObjC is unavailable"""
+        if NSSpeechSynthesizer is None:
+            return None
+        
+        with tempfile.NamedTemporaryFile(suffix='.aiff', delete=False) as temp_file:
+            temp_path = temp_file.name
+        
+        try:
+            synths = getattr(self._native_synths, 'by_voice', None)
+            if synths is None:
+                synths = self._native_synths.by_voice = {}
+            synth = synths.get(voice_profile.voice_id)
+            if synth is None:
+                voice = f"com.apple.speech.synthesis.voice.{voice_profile.voice_id.lower()}"
+                synth = NSSpeechSynthesizer.alloc().initWithVoice_(voice)
+                if synth is None:
+                    return None
+                synths[voice_profile.voice_id] = synth
+            
+            synth.setRate_(voice_profile.rate)
+            if not synth.startSpeakingString_toURL_(text, NSURL.fileURLWithPath_(temp_path)):
+                return None
+            
+            # Rendering to a file is asynchronous; wait for it like the say timeout
+            deadline = time.monotonic() + 30
+            while synth.isSpeaking():
+                if time.monotonic() > deadline:
+                    synth.stopSpeaking()
+                    logger.error("TTS generation timed out")
+                    return b""
+                time.sleep(0.005)
+            
+            with open(temp_path, 'rb') as f:
+                return f.read() or None
+            
+        except Exception as e:
+            logger.warning(f"NSSpeechSynthesizer failed, using say: {e}")
+            return None
+        finally:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+    
+    def _get_say_pool(self) -> Optional[queue.Queue]:
+        """Start the say worker pool once; None where say is unavailable"""
+        with self._say_pool_lock:
+            if self._say_pool is None:
+                self._say_pool = queue.Queue()
+                if shutil.which("say") and shutil.which("bash"):
+                    for _ in range(SAY_POOL_SIZE):
+                        self._say_pool.put(subprocess.Popen(
+                            ["bash", "-c", SAY_WORKER_SCRIPT],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL
+                        ))
+                    atexit.register(self._stop_say_pool)
+            return self._say_pool
+    
+    def _stop_say_pool(self):
+        while True:
+            try:
+                worker = self._say_pool.get_nowait()
+            except queue.Empty:
+                break
+            worker.stdin.close()
+            worker.wait(timeout=5)
+    
+    def _pooled_say(self, text: str, voice_profile: VoiceProfile) -> Optional[bytes]:
+        """Render with a warm say worker; None if none is free or the worker died"""
+        try:
+            worker = self._get_say_pool().get_nowait()
+        except queue.Empty:
+            return None
+        
+        # A hung say is killed like the one-shot timeout; the read then ends early
+        watchdog = threading.Timer(30, worker.kill)
+        watchdog.start()
+        try:
+            request = " ".join(text.split())
+            worker.stdin.write(f"{voice_profile.voice_id}\t{voice_profile.rate}\t{request}\n".encode())
+            worker.stdin.flush()
+            
+            header = worker.stdout.readline()
+            size = int(header) if header.strip() else -1
+            audio_data = worker.stdout.read(size) if size > 0 else b""
+            if size < 0 or len(audio_data) != size:
+                raise OSError("say worker exited")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding say worker: {e}")
+            worker.kill()
+            return None
+        finally:
+            watchdog.cancel()
+        
+        self._say_pool.put(worker)
+        if not audio_data:
+            logger.error("say command failed in worker")
+        return audio_data
+    
+    def _local_macos_tts_via_file(self, text: str, voice_profile: VoiceProfile) -> bytes:
+        """macOS say rendering through a temporary AIFF file"""
         with tempfile.NamedTemporaryFile(suffix='.aiff', delete=False) as temp_file:
             temp_path = temp_file.name
         
         try:
             # Use macOS say command with voice customization
-            cmd = [
-                "say",
-                "-v", voice_profile.voice_id,
-                "-r", str(voice_profile.rate),
-                "-o", temp_path,
-                text
-            ]
+            cmd = (*voice_profile.say_prefix, "-o", temp_path, text)
             
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
             
@@ -279,21 +934,22 @@ class CostOptimizedTTS:
     
     def _update_usage(self, character_count: int, provider: TTSProvider):
         """Update usage tracking and costs"""
-        self.usage.characters_used += character_count
-        self.usage.api_calls_made += 1
-        
-        # Calculate cost
-        if provider != TTSProvider.LOCAL_SAY:
-            # Check if within free tier
-            free_limit = self.free_tier_limits.get(provider, 0)
-            if self.usage.characters_used > free_limit:
-                # Calculate cost for characters over free limit
-                paid_chars = min(character_count, self.usage.characters_used - free_limit)
-                cost_per_char = self.provider_costs[provider] / 1_000_000
-                additional_cost = paid_chars * cost_per_char
-                self.usage.current_spend += additional_cost
-        
-        self._save_usage()
+        # Batch workers update usage concurrently
+        with self._usage_lock:
+            self.usage.characters_used += character_count
+            self.usage.api_calls_made += 1
+            
+            # Calculate cost
+            if provider != TTSProvider.LOCAL_SAY:
+                # Check if within free tier
+                free_limit = self.free_tier_limits.get(provider, 0)
+                if self.usage.characters_used > free_limit:
+                    # Calculate cost for characters over free limit
+                    paid_chars = min(character_count, self.usage.characters_used - free_limit)
+                    additional_cost = paid_chars * self._cost_per_char[provider]
+                    self.usage.current_spend += additional_cost
+            
+            self._usage_dirty = True
     
     def get_cost_report(self) -> Dict[str, Any]:
         """Generate detailed cost and usage report"""
@@ -304,6 +960,7 @@ class CostOptimizedTTS:
             "current_spend": round(self.usage.current_spend, 2),
             "monthly_budget": self.monthly_budget,
             "budget_remaining": round(self.monthly_budget - self.usage.current_spend, 2),
+            "cache_hits": self.usage.cache_hits,
             "free_tier_status": {}
         }
         
@@ -321,8 +978,9 @@ class CostOptimizedTTS:
     
     def reset_monthly_usage(self):
         """Reset usage counters for new month"""
-        self.usage = TTSUsage(last_reset=datetime.now().strftime("%Y-%m"))
-        self._save_usage()
+        with self._usage_lock:
+            self.usage = TTSUsage(last_reset=datetime.now().strftime("%Y-%m"))
+            self._save_usage()
         logger.info("Monthly usage reset")
 
 def get_available_voices() -> Dict[str, list]:
@@ -12,15 +12,117 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import re
+import time
+import hashlib
 import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import replace
 from contextlib import contextmanager
 
+try:
+    import ahocorasick  # Single-pass multi-word scanning when installed
+except ImportError:
+    ahocorasick = None
+
+try:
+    import ciso8601  # C ISO 8601 parser, handles 'Z' natively
+except ImportError:
+    ciso8601 = None
+
+try:
+    import numpy as np
+    from numba import njit  # Compiled range checks for validate_batch
+except ImportError:
+    np = njit = None
+
 from config import get_config
 from analytics_engine import get_analytics_engine
 
 logger = logging.getLogger(__name__)
 config = get_config()
 
+# Most validation reports kept for repeated identical inputs
+RESULT_CACHE_SIZE = 1024
+
+# Wall-clock offset of the monotonic clock, for turning report timestamps into datetimes
+_MONOTONIC_EPOCH_NS = time.time_ns() - time.monotonic_ns()
+
+# Patterns used by the validators, compiled once
+_PHONE_CLEAN_RE = re.compile(r'[^\d+]')
+# Deletes every Latin-1 character except ASCII digits and '+'
+_PHONE_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(256) if chr(c) not in '0123456789+'))
+_UUID_CHARS = frozenset('0123456789abcdefABCDEF-')
+# Potentially harmful content, as a single alternation
+_HARMFUL_RE = re.compile(
+    r'personal\s+information|contact\s+details|address|phone\s+number|violent|inappropriate',
+    re.IGNORECASE
+)
+
+def _word_scanner(words: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Build a predicate telling whether lowercase text contains any of the words"""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for word in words:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    pattern = re.compile('|'.join(map(re.escape, words)))
+    return lambda text: pattern.search(text) is not None
+
+# Logical next events for each analytics event (e.g. call_start before story_begin)
+_VALID_TRANSITIONS = {
+    'call_start': ['registration', 'story_begin', 'call_end'],
+    'registration': ['story_begin', 'call_end'],
+    'story_begin': ['pause', 'skip', 'completion', 'call_end'],
+    'pause': ['story_begin', 'skip', 'completion', 'call_end'],
+    'skip': ['story_begin', 'call_end'],
+    'completion': ['story_begin', 'call_end'],
+    'replay': ['story_begin', 'completion', 'call_end']
+}
+# Event -> bit index, and source event index -> bitmask of allowed next events
+_EVENT_ID = {event: i for i, event in enumerate(
+    dict.fromkeys([*_VALID_TRANSITIONS, *(e for nexts in _VALID_TRANSITIONS.values() for e in nexts)])
+)}
+_TRANSITION_MASK = {
+    _EVENT_ID[event]: sum(1 << _EVENT_ID[next_event] for next_event in nexts)
+    for event, nexts in _VALID_TRANSITIONS.items()
+}
+
+if njit is not None:
+    @njit(cache=True)
+    def _check_analytics(metric_value, completion_rate):
+        """Per-row results of the numeric analytics rules"""
+        n = metric_value.shape[0]
+        out = np.ones((2, n), np.bool_)
+        for i in range(n):
+            if not (0.0 <= metric_value[i] and metric_value[i] <= 1.0):
+                out[0, i] = False
+            if not (0.0 <= completion_rate[i] and completion_rate[i] <= 1.0):
+                out[1, i] = False
+        return out
+    
+    @njit(cache=True)
+    def _check_business(monthly_usage, usage_limit, conversion, monthly_revenue, subscriber_count, avg_price):
+        """Per-row results of the numeric business rules"""
+        n = monthly_usage.shape[0]
+        out = np.ones((3, n), np.bool_)
+        for i in range(n):
+            if monthly_usage[i] > usage_limit:
+                out[0, i] = False
+            if not (0.0 <= conversion[i] and conversion[i] <= 1.0):
+                out[1, i] = False
+            if subscriber_count[i] <= 0 or avg_price[i] <= 0:
+                out[2, i] = monthly_revenue[i] == 0
+            else:
+                expected_revenue = subscriber_count[i] * avg_price[i]
+                out[2, i] = abs(monthly_revenue[i] - expected_revenue) * 20.0 <= expected_revenue
+        return out
+
+# Words not allowed for young (<= 5) and for mid-age (<= 8) listeners
+_YOUNG_INAPPROPRIATE = _word_scanner(('violence', 'scary', 'frightening', 'death', 'kill'))
+_SEVERE_INAPPROPRIATE = _word_scanner(('violence', 'death', 'kill'))
+
 class ValidationLevel(Enum):
     """Validation strictness levels"""
     BASIC = "basic"
@@ -28,6 +130,14 @@ class ValidationLevel(Enum):
     STRICT = "strict"
     PARANOID = "paranoid"
 
+# Strictness order; rule levels are compared by rank, not by their string values
+_LEVEL_RANK = {
+    ValidationLevel.BASIC: 0,
+    ValidationLevel.STANDARD: 1,
+    ValidationLevel.STRICT: 2,
+    ValidationLevel.PARANOID: 3
+}
+
 class InterfaceType(Enum):
     """Interface types for validation"""
     PHONE = "phone"
@@ -36,7 +146,7 @@ class InterfaceType(Enum):
     ANALYTICS = "analytics"
     BUSINESS = "business"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ValidationRule:
     """Individual validation rule"""
     name: str
@@ -45,8 +155,9 @@ class ValidationRule:
     weight: float = 1.0
     interface: InterfaceType = InterfaceType.DATABASE
     level: ValidationLevel = ValidationLevel.STANDARD
+    cacheable: bool = True  # False when the outcome depends on state outside the data
 
-@dataclass
+@dataclass(slots=True)
 class ValidationReport:
     """Comprehensive validation report"""
     interface_type: str
@@ -57,7 +168,15 @@ class ValidationReport:
     confidence_score: float
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: int = field(default_factory=time.monotonic_ns)  # see timestamp_dt
+    # confidence_score = weighted_numerator / weighted_denominator (passed / total rule weight)
+    weighted_numerator: float = 0.0
+    weighted_denominator: float = 0.0
+    
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Local time the report was created"""
+        return datetime.fromtimestamp((self.timestamp + _MONOTONIC_EPOCH_NS) / 1e9)
     
     @property
     def success_rate(self) -> float:
@@ -77,6 +196,22 @@ class DataValidationLayer:
         self.analytics = get_analytics_engine()
         self._validation_rules = self._initialize_validation_rules()
         
+        # Rules that apply at this validation level, per interface
+        level_rank = _LEVEL_RANK[validation_level]
+        self._active_rules = {
+            interface: tuple(r for r in rules if _LEVEL_RANK[r.level] <= level_rank)
+            for interface, rules in self._validation_rules.items()
+        }
+        
+        # Reports for repeated inputs, keyed by content digest, oldest first;
+        # only interfaces whose active rules depend on nothing but the data are cached
+        self._cacheable_interfaces = frozenset(
+            interface for interface, rules in self._active_rules.items()
+            if all(r.cacheable for r in rules)
+        )
+        self._result_cache: OrderedDict = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        
     def _initialize_validation_rules(self) -> Dict[str, List[ValidationRule]]:
         """Initialize validation rules for each interface"""
         return {
@@ -149,7 +284,8 @@ class DataValidationLayer:
                 validator=lambda x: self._validate_foreign_keys(x),
                 error_message="Foreign key constraint violation",
                 interface=InterfaceType.DATABASE,
-                level=ValidationLevel.STRICT
+                level=ValidationLevel.STRICT,
+                cacheable=False
             )
         ]
     
@@ -209,10 +345,12 @@ class DataValidationLayer:
     
     def _get_business_validation_rules(self) -> List[ValidationRule]:
         """Validation rules for business logic"""
+        # Bound into the lambda once rather than looked up through config per call
+        free_tier_limit = config.business.free_tier_stories_per_month
         return [
             ValidationRule(
                 name="freemium_usage_limit",
-                validator=lambda x: x.get('monthly_usage', 0) <= config.business.free_tier_stories_per_month,
+                validator=lambda x, _limit=free_tier_limit: x.get('monthly_usage', 0) <= _limit,
                 error_message="Freemium usage limit exceeded",
                 interface=InterfaceType.BUSINESS
             ),
@@ -231,14 +369,137 @@ class DataValidationLayer:
             )
         ]
     
-    def validate_interface_data(self, interface: str, data: Dict[str, Any]) -> ValidationReport:
-        """Validate data for specific interface"""
+    def validate_interface_data(self, interface: str, data: Dict[str, Any],
+                                collect_errors: bool = True) -> ValidationReport:
+        """Validate data for specific interface
+        
+        Pass collect_errors=False when only the counts and scores are needed;
+        the report's errors list is then left empty.
+        """
+        if interface not in self._validation_rules:
+            raise ValueError(f"Unknown interface: {interface}")
+        
+        report = self._validate_untracked(interface, data, collect_errors)
+        
+        # Track validation results
+        self.analytics.track_system_health_batch(
+            self._health_metrics(interface, report.success_rate, report.confidence_score))
+        
+        return report
+    
+    @staticmethod
+    def _health_metrics(interface: str, success_rate: float,
+                        confidence_score: float) -> List[Tuple[str, float, str]]:
+        """System health rows recorded for a validation of one interface"""
+        return [
+            (f'{interface}_validation_rate', success_rate, interface),
+            (f'{interface}_confidence_score', confidence_score, interface)
+        ]
+    
+    def _validate_untracked(self, interface: str, data: Dict[str, Any],
+                            collect_errors: bool = True) -> ValidationReport:
+        """validate_interface_data without the health tracking, for callers that batch it"""
+        applicable_rules = self._active_rules[interface]
+        
+        key = None
+        if interface in self._cacheable_interfaces:
+            key = self._result_key(interface, data, collect_errors)
+        
+        report = None
+        if key is not None:
+            with self._result_cache_lock:
+                cached = self._result_cache.get(key)
+                if cached is not None:
+                    self._result_cache.move_to_end(key)
+            if cached is not None:
+                # Callers own their report; hand out a fresh copy
+                report = replace(cached, errors=list(cached.errors), warnings=list(cached.warnings),
+                                 timestamp=time.monotonic_ns())
+        
+        if report is None:
+            if interface == 'ai':
+                data = self._with_lowercase_text(data)
+            
+            report = self._apply_rules(interface, data, applicable_rules, collect_errors=collect_errors)
+            
+            if key is not None:
+                with self._result_cache_lock:
+                    self._result_cache[key] = replace(report, errors=list(report.errors),
+                                                      warnings=list(report.warnings))
+                    if len(self._result_cache) > RESULT_CACHE_SIZE:
+                        self._result_cache.popitem(last=False)
+        
+        return report
+    
+    @staticmethod
+    def _result_key(interface: str, data: Dict[str, Any], collect_errors: bool) -> Optional[bytes]:
+        """Hash of the canonicalized input, or None if it cannot be canonicalized"""
+        try:
+            # No default=: a non-JSON value must not hash like its string form
+            canonical = json.dumps([interface, collect_errors, data], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+    
+    def validate_batch(self, interface: str, records: List[Dict[str, Any]],
+                       collect_errors: bool = True) -> List[ValidationReport]:
+        """Validate many records for one interface, tracking the batch averages once
+        
+        With numba installed, the numeric analytics and business rules run for
+        all records in one compiled pass; other rules run per record.
+        """
         if interface not in self._validation_rules:
             raise ValueError(f"Unknown interface: {interface}")
         
-        rules = self._validation_rules[interface]
-        applicable_rules = [r for r in rules if r.level.value <= self.validation_level.value or r.level == ValidationLevel.BASIC]
+        applicable_rules = self._active_rules[interface]
+        precomputed = self._numeric_batch_results(interface, records)
         
+        reports = []
+        for row, data in enumerate(records):
+            if interface == 'ai':
+                data = self._with_lowercase_text(data)
+            row_results = {name: bool(results[row]) for name, results in precomputed.items()}
+            reports.append(self._apply_rules(interface, data, applicable_rules, row_results, collect_errors))
+        
+        if reports:
+            success_rate = sum(r.success_rate for r in reports) / len(reports)
+            confidence_score = sum(r.confidence_score for r in reports) / len(reports)
+            self.analytics.track_system_health_batch(
+                self._health_metrics(interface, success_rate, confidence_score))
+        
+        return reports
+    
+    def _numeric_batch_results(self, interface: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rule name -> per-record results from the compiled kernels; empty when unavailable"""
+        if njit is None or not records or interface not in ('analytics', 'business'):
+            return {}
+        
+        if interface == 'analytics':
+            fields = ('metric_value', 'completion_rate')
+            names = ('metric_value_range', 'completion_rate_realistic')
+        else:
+            fields = ('monthly_usage', 'conversion_probability', 'monthly_revenue',
+                      'subscriber_count', 'average_subscription_price')
+            names = ('freemium_usage_limit', 'conversion_rate_realistic', 'revenue_calculation_accurate')
+        
+        columns = [[record.get(name, 0) for record in records] for name in fields]
+        # Anything non-numeric keeps its per-record rule (and its error message)
+        if not all(type(value) in (int, float) for column in columns for value in column):
+            return {}
+        arrays = [np.asarray(column, dtype=np.float64) for column in columns]
+        
+        if interface == 'analytics':
+            results = _check_analytics(*arrays)
+        else:
+            usage, conversion, revenue, subscribers, price = arrays
+            results = _check_business(usage, float(config.business.free_tier_stories_per_month),
+                                      conversion, revenue, subscribers, price)
+        return dict(zip(names, results))
+    
+    def _apply_rules(self, interface: str, data: Dict[str, Any], applicable_rules: Tuple[ValidationRule, ...],
+                     precomputed: Optional[Dict[str, bool]] = None,
+                     collect_errors: bool = True) -> ValidationReport:
+        """Run the rules against one record and build its report"""
         passed_checks = 0
         failed_checks = 0
         errors = []
@@ -248,7 +509,10 @@ class DataValidationLayer:
         
         for rule in applicable_rules:
             try:
-                is_valid = rule.validator(data)
+                if precomputed and rule.name in precomputed:
+                    is_valid = precomputed[rule.name]
+                else:
+                    is_valid = rule.validator(data)
                 total_weight += rule.weight
                 
                 if is_valid:
@@ -256,16 +520,20 @@ class DataValidationLayer:
                     weighted_score += rule.weight
                 else:
                     failed_checks += 1
-                    errors.append(f"{rule.name}: {rule.error_message}")
+                    if collect_errors:
+                        errors.append(f"{rule.name}: {rule.error_message}")
                     
-            except Exception as e:
+            except (TypeError, ValueError, KeyError, AttributeError) as e:
+                # Malformed input (wrong types, missing nesting) fails the rule; other
+                # exceptions are bugs in the validator and propagate
                 failed_checks += 1
-                errors.append(f"{rule.name}: Validation error - {str(e)}")
+                if collect_errors:
+                    errors.append(f"{rule.name}: Validation error - {str(e)}")
                 logger.error(f"Validation rule {rule.name} failed: {e}")
         
         confidence_score = weighted_score / total_weight if total_weight > 0 else 0.0
         
-        report = ValidationReport(
+        return ValidationReport(
             interface_type=interface,
             data_type=data.get('data_type', 'unknown'),
             total_checks=len(applicable_rules),
@@ -273,14 +541,22 @@ class DataValidationLayer:
             failed_checks=failed_checks,
             confidence_score=confidence_score,
             errors=errors,
-            warnings=warnings
+            warnings=warnings,
+            weighted_numerator=weighted_score,
+            weighted_denominator=total_weight
         )
+    
+    def _with_lowercase_text(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Shadow copy of AI data with story and interests lowercased once for all rules"""
+        story_content = data.get('story_content')
+        if not isinstance(story_content, str):
+            return data
         
-        # Track validation results
-        self.analytics.track_system_health(f'{interface}_validation_rate', report.success_rate, interface)
-        self.analytics.track_system_health(f'{interface}_confidence_score', confidence_score, interface)
-        
-        return report
+        shadow = {**data, '_story_content_lower': story_content.lower()}
+        interests = data.get('child_interests')
+        if isinstance(interests, list) and all(isinstance(i, str) for i in interests):
+            shadow['_interests_lower'] = [i.lower() for i in interests]
+        return shadow
     
     def validate_cross_interface_consistency(self, data_sets: Dict[str, Dict[str, Any]]) -> ValidationReport:
         """Validate consistency across multiple interfaces"""
@@ -289,11 +565,12 @@ class DataValidationLayer:
         passed_checks = 0
         total_checks = 0
         
+        db_data = data_sets.get('database')
+        analytics_data = data_sets.get('analytics')
+        phone_data = data_sets.get('phone')
+        
         # Check for data consistency between interfaces
-        if 'database' in data_sets and 'analytics' in data_sets:
-            db_data = data_sets['database']
-            analytics_data = data_sets['analytics']
-            
+        if db_data is not None and analytics_data is not None:
             # Verify child_id consistency
             total_checks += 1
             if db_data.get('child_id') == analytics_data.get('child_id'):
@@ -311,13 +588,12 @@ class DataValidationLayer:
                 errors.append(f"Story count mismatch: DB={db_story_count}, Analytics={analytics_story_count}")
         
         # Check phone and database consistency
-        if 'phone' in data_sets and 'database' in data_sets:
-            phone_data = data_sets['phone']
-            db_data = data_sets['database']
-            
+        if phone_data is not None and db_data is not None:
             total_checks += 1
-            if phone_data.get('session_id') and db_data.get('session_id'):
-                if phone_data['session_id'] == db_data['session_id']:
+            phone_session = phone_data.get('session_id')
+            db_session = db_data.get('session_id')
+            if phone_session and db_session:
+                if phone_session == db_session:
                     passed_checks += 1
                 else:
                     errors.append("Session ID mismatch between phone and database")
@@ -342,9 +618,15 @@ class DataValidationLayer:
         if not phone:
             return False
         # Remove common formatting
-        clean_phone = re.sub(r'[^\d+]', '', phone)
-        # Check for valid US/international format
-        return re.match(r'^\+?1?\d{10,15}$', clean_phone) is not None
+        clean_phone = phone.translate(_PHONE_TABLE)
+        if not clean_phone.isascii():
+            # Characters beyond Latin-1 (e.g. non-ASCII digits); strip the slow way
+            clean_phone = _PHONE_CLEAN_RE.sub('', phone)
+        # Valid US/international format: optional '+', optional leading 1, 10-15 digits
+        digits = clean_phone[1:] if clean_phone.startswith('+') else clean_phone
+        if not digits.isdecimal():
+            return False
+        return 10 <= len(digits) <= 15 or (len(digits) == 16 and digits[0] == '1')
     
     def _validate_session_id(self, session_id: str) -> bool:
         """Validate session ID format"""
@@ -352,13 +634,22 @@ class DataValidationLayer:
     
     def _validate_uuid(self, uuid_str: str) -> bool:
         """Validate UUID format"""
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        return re.match(uuid_pattern, uuid_str, re.IGNORECASE) is not None
+        # 8-4-4-4-12 hex digits: fixed length, hyphens at fixed offsets, hex elsewhere
+        return (len(uuid_str) == 36 and
+                uuid_str[8] == uuid_str[13] == uuid_str[18] == uuid_str[23] == '-' and
+                uuid_str.count('-') == 4 and
+                _UUID_CHARS.issuperset(uuid_str))
     
     def _validate_timestamp(self, timestamp: str) -> bool:
         """Validate ISO timestamp format"""
+        # Shortest ISO date is YYYYMMDD; reject empties without raising
+        if len(timestamp) < 8:
+            return False
         try:
-            datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            if ciso8601 is not None:
+                ciso8601.parse_datetime(timestamp)
+            else:
+                datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
             return True
         except ValueError:
             return False
@@ -369,39 +660,30 @@ class DataValidationLayer:
         child_age = data.get('child_age', 5)
         
         # Basic age-appropriateness checks
-        inappropriate_words = ['violence', 'scary', 'frightening', 'death', 'kill']
-        
         if child_age <= 5:
             # Very strict for young children
-            return not any(word in story_content.lower() for word in inappropriate_words)
+            return not _YOUNG_INAPPROPRIATE(self._lowercase_story(data))
         elif child_age <= 8:
             # Moderate restrictions
-            severe_words = ['violence', 'death', 'kill']
-            return not any(word in story_content.lower() for word in severe_words)
+            return not _SEVERE_INAPPROPRIATE(self._lowercase_story(data))
         else:
             # More lenient for older children
             return len(story_content) > 0
     
+    def _lowercase_story(self, data: Dict[str, Any]) -> str:
+        """Lowercased story content, reusing the copy made by validate_interface_data"""
+        story_lower = data.get('_story_content_lower')
+        if story_lower is None:
+            story_lower = data.get('story_content', '').lower()
+        return story_lower
+    
     def _validate_content_safety(self, content: str) -> bool:
         """Validate content safety"""
         if not content:
             return False
         
         # Check for potentially harmful content
-        harmful_patterns = [
-            r'personal\s+information',
-            r'contact\s+details',
-            r'address',
-            r'phone\s+number',
-            r'violent',
-            r'inappropriate'
-        ]
-        
-        for pattern in harmful_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return False
-        
-        return True
+        return _HARMFUL_RE.search(content) is None
     
     def _validate_personalization(self, data: Dict[str, Any]) -> bool:
         """Validate personalization accuracy"""
@@ -412,8 +694,10 @@ class DataValidationLayer:
             return True  # Can't validate without data
         
         # Check if story content matches at least one interest
-        for interest in interests:
-            if interest.lower() in story_content.lower():
+        story_lower = self._lowercase_story(data)
+        interests_lower = data.get('_interests_lower') or [i.lower() for i in interests]
+        for interest in interests_lower:
+            if interest in story_lower:
                 return True
         
         return False
@@ -425,25 +709,14 @@ class DataValidationLayer:
         if not events:
             return True
         
-        # Check for logical sequence (e.g., call_start before story_begin)
-        valid_transitions = {
-            'call_start': ['registration', 'story_begin', 'call_end'],
-            'registration': ['story_begin', 'call_end'],
-            'story_begin': ['pause', 'skip', 'completion', 'call_end'],
-            'pause': ['story_begin', 'skip', 'completion', 'call_end'],
-            'skip': ['story_begin', 'call_end'],
-            'completion': ['story_begin', 'call_end'],
-            'replay': ['story_begin', 'completion', 'call_end']
-        }
-        
-        for i in range(len(events) - 1):
-            current_event = events[i]
-            next_event = events[i + 1]
-            
-            if current_event not in valid_transitions:
+        # Check for logical sequence; events without listed transitions are not checked
+        event_ids = [_EVENT_ID.get(event) for event in events]
+        for current_id, next_id in zip(event_ids, event_ids[1:]):
+            allowed = _TRANSITION_MASK.get(current_id)
+            if allowed is None:
                 continue
             
-            if next_event not in valid_transitions[current_event]:
+            if next_id is None or not (allowed >> next_id) & 1:
                 return False
         
         return True
@@ -464,23 +737,28 @@ class DataValidationLayer:
         subscriber_count = data.get('subscriber_count', 0)
         avg_price = data.get('average_subscription_price', 0)
         
-        if subscriber_count == 0 or avg_price == 0:
+        if subscriber_count <= 0 or avg_price <= 0:
             return monthly_revenue == 0
         
+        # 5% tolerance, as |diff| * 20 <= expected (expected is positive here)
         expected_revenue = subscriber_count * avg_price
-        return abs(monthly_revenue - expected_revenue) / expected_revenue <= 0.05  # 5% tolerance
+        diff = monthly_revenue - expected_revenue
+        return (diff if diff >= 0 else -diff) * 20.0 <= expected_revenue
     
     def generate_comprehensive_report(self, data_sources: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Generate comprehensive validation report across all interfaces"""
         reports = {}
-        overall_confidence = 0.0
+        weighted_score = 0.0
+        total_weight = 0.0
         total_checks = 0
         passed_checks = 0
+        health_metrics = []
         
-        # Validate each interface
+        # Validate each interface; health tracking is written in one commit afterwards
         for interface, data in data_sources.items():
             if interface in self._validation_rules:
-                report = self.validate_interface_data(interface, data)
+                report = self._validate_untracked(interface, data)
+                health_metrics += self._health_metrics(interface, report.success_rate, report.confidence_score)
                 reports[interface] = {
                     'success_rate': report.success_rate,
                     'confidence_score': report.confidence_score,
@@ -489,10 +767,13 @@ class DataValidationLayer:
                     'warnings': report.warnings
                 }
                 
-                overall_confidence += report.confidence_score
+                weighted_score += report.weighted_numerator
+                total_weight += report.weighted_denominator
                 total_checks += report.total_checks
                 passed_checks += report.passed_checks
         
+        self.analytics.track_system_health_batch(health_metrics)
+        
         # Cross-interface validation
         cross_interface_report = self.validate_cross_interface_consistency(data_sources)
         reports['cross_interface'] = {
@@ -504,8 +785,8 @@ class DataValidationLayer:
         }
         
         # Calculate overall metrics
-        interface_count = len([r for r in reports if r != 'cross_interface'])
-        overall_confidence = overall_confidence / interface_count if interface_count > 0 else 0.0
+        # Weighted by rule weight across all interfaces, not averaged per interface
+        overall_confidence = weighted_score / total_weight if total_weight > 0 else 0.0
         overall_success_rate = passed_checks / total_checks if total_checks > 0 else 0.0
         
         return {